@@ -0,0 +1,413 @@
+"""AWS CLI bridge - Translate AWS CLI commands into in-process boto3 calls.
+
+Also holds the config parsing and output handling that both servers share.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Timeout scope that runs in the current task, unlike wait_for which wraps it in a new one
+try:
+    from asyncio import timeout as async_timeout
+except ImportError:
+    from async_timeout import timeout as async_timeout
+
+try:
+    import boto3
+    from botocore import xform_name
+    from botocore.exceptions import BotoCoreError, ClientError, ParamValidationError
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+# CLI service names that differ from their boto3 client names
+CLI_SERVICE_ALIASES = {"s3api": "s3", "configservice": "config", "deploy": "codedeploy"}
+
+# CLI services implemented as custom commands rather than API operations
+CLI_ONLY_SERVICES = {"s3", "ddb", "configure", "history"}
+
+# Global CLI options that change output or behaviour and have no boto3 equivalent
+_CLI_GLOBAL_FLAGS = {
+    "output", "query", "no-paginate", "page-size", "max-items", "starting-token",
+    "debug", "endpoint-url", "no-verify-ssl", "ca-bundle", "no-sign-request",
+    "cli-input-json", "cli-input-yaml", "generate-cli-skeleton", "cli-binary-format",
+    "cli-read-timeout", "cli-connect-timeout", "color", "no-cli-pager", "cli-auto-prompt",
+    "profile", "region",
+}
+
+# Upper bound on command output kept in memory for a single response (10 MiB)
+MAX_OUTPUT_BYTES = 10 << 20
+
+# Result for a command, CLI or in-process, that runs for more than 30 seconds
+TIMEOUT_MESSAGE = "Command timed out after 30 seconds"
+
+# Profile settings surfaced by list_aws_profiles
+PROFILE_KEYS = ("region", "output", "role_arn")
+
+# One line of an AWS config file: its indentation and its content, stripped
+_CONFIG_LINE_RE = re.compile(rb"^([ \t]*)([^\r\n]*?)[ \t\r]*$", re.MULTILINE)
+# ConfigParser's section header and key patterns; anything after "]" is ignored
+_SECTION_RE = re.compile(rb"\[(.+)\]")
+_OPTION_RE = re.compile(rb"(.*?)[ \t]*[=:][ \t]*(.*)")
+_PROFILE_KEY_BYTES = frozenset(key.encode() for key in PROFILE_KEYS)
+
+# (profile, region, service, method) identifying an in-process API call
+CallKey = Tuple[Optional[str], Optional[str], str, str]
+
+_SCALAR_CONVERTERS = {
+    "string": str, "timestamp": str,
+    "integer": int, "long": int,
+    "float": float, "double": float,
+}
+
+
+def parse_aws_config(data: Any) -> Dict[str, Dict[str, str]]:
+    """Extract profile settings from the raw bytes (or an mmap) of an AWS config file.
+    
+    Follows ConfigParser's rules - [section] headers, '=' or ':' delimited keys,
+    full-line # and ; comments, indented continuation lines (such as nested s3
+    settings) and a [DEFAULT] section every profile inherits - without building
+    its section hierarchy, and only decodes the keys in PROFILE_KEYS.
+    """
+    # Values are kept as lists of lines until the end, since continuation lines
+    # may still extend them
+    profiles: Dict[str, Dict[str, List[bytes]]] = {}
+    defaults: Dict[str, List[bytes]] = {}
+    current: Optional[Dict[str, List[bytes]]] = None
+    value: Optional[List[bytes]] = None
+    in_value = False
+    indent_level = 0
+    
+    for match in _CONFIG_LINE_RE.finditer(data):
+        indent, line = match.groups()
+        if not line:
+            # Blank lines inside a value are kept, as ConfigParser does
+            if value is not None:
+                value.append(b"")
+            continue
+        if line[:1] in (b"#", b";"):
+            continue
+        
+        # A line indented past the last key continues its value
+        if in_value and len(indent) > indent_level:
+            if value is not None:
+                value.append(line)
+            continue
+        indent_level = len(indent)
+        
+        section = _SECTION_RE.match(line)
+        if section is not None:
+            name = section.group(1).decode("utf-8", "replace")
+            if name == "DEFAULT":
+                current = defaults
+            else:
+                current = profiles.setdefault(name[len("profile "):] if name.startswith("profile ") else name, {})
+            in_value, value = False, None
+            continue
+        
+        option = _OPTION_RE.match(line) if current is not None else None
+        if option is None:
+            continue
+        in_value = True
+        key = option.group(1).lower()
+        if key in _PROFILE_KEY_BYTES:
+            value = current[key.decode()] = [option.group(2)]
+        else:
+            value = None
+    
+    result: Dict[str, Dict[str, str]] = {}
+    for name, info in profiles.items():
+        merged = {**defaults, **info}
+        # Report keys in a stable order regardless of their order in the file
+        result[name] = {key: b"\n".join(merged[key]).rstrip().decode("utf-8", "replace")
+                        for key in PROFILE_KEYS if key in merged}
+    return result
+
+
+@lru_cache(maxsize=None)
+def _cli_operation_names(service_model: Any) -> Dict[str, str]:
+    """Map CLI operation names (describe-instances) to API names (DescribeInstances)."""
+    return {xform_name(name, "-"): name for name in service_model.operation_names}
+
+
+def _convert_cli_values(shape: Any, values: List[str], negated: bool) -> Any:
+    """Convert raw CLI argument values to the type expected by a botocore shape.
+
+    Raises ValueError for anything the CLI would expand itself (file:// values,
+    JSON or shorthand structures, blobs) so the caller falls back to the CLI.
+    """
+    if any(value.startswith(("file://", "fileb://", "[", "{")) for value in values):
+        raise ValueError("CLI-expanded value")
+    
+    if shape.type_name == "boolean":
+        if values:
+            raise ValueError("boolean flags take no value")
+        return not negated
+    if negated:
+        raise ValueError("--no- prefix on a non-boolean parameter")
+    
+    if shape.type_name == "list":
+        convert = _SCALAR_CONVERTERS.get(shape.member.type_name)
+        if convert is None or not values:
+            raise ValueError(f"unsupported list member type {shape.member.type_name}")
+        return [convert(value) for value in values]
+    
+    convert = _SCALAR_CONVERTERS.get(shape.type_name)
+    if convert is None or len(values) != 1:
+        raise ValueError(f"unsupported parameter type {shape.type_name}")
+    return convert(values[0])
+
+
+def translate_cli_args(client: Any, operation: str, args: Tuple[str, ...]) -> Tuple[str, Dict[str, Any]]:
+    """Translate CLI operation and arguments into a boto3 method name and kwargs.
+
+    Raises ValueError when the command cannot be expressed as a plain API call.
+    """
+    operation_name = _cli_operation_names(client.meta.service_model).get(operation)
+    if operation_name is None:
+        raise ValueError(f"unknown operation {operation}")
+    
+    input_shape = client.meta.service_model.operation_model(operation_name).input_shape
+    members = input_shape.members if input_shape is not None else {}
+    params_by_flag = {xform_name(name, "-"): (name, shape) for name, shape in members.items()}
+    
+    kwargs: Dict[str, Any] = {}
+    i = 0
+    while i < len(args):
+        token = args[i]
+        if not token.startswith("--"):
+            raise ValueError(f"unexpected positional argument {token}")
+        flag, has_inline, inline_value = token[2:].partition("=")
+        values = [inline_value] if has_inline else []
+        i += 1
+        while not has_inline and i < len(args) and not args[i].startswith("--"):
+            values.append(args[i])
+            i += 1
+        
+        if flag in _CLI_GLOBAL_FLAGS:
+            raise ValueError(f"global option --{flag}")
+        negated = False
+        if flag not in params_by_flag and flag.startswith("no-"):
+            flag, negated = flag[3:], True
+        if flag not in params_by_flag:
+            raise ValueError(f"unknown parameter --{flag}")
+        
+        name, shape = params_by_flag[flag]
+        kwargs[name] = _convert_cli_values(shape, values, negated)
+    
+    return xform_name(operation_name), kwargs
+
+
+def invoke(client: Any, method: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Call a boto3 client method, following pagination like the CLI does.
+
+    As in the CLI, passing the paginator's limit or token parameter (--limit,
+    --max-results, --next-token, --marker, ...) turns auto-pagination off, so a
+    single page is returned along with its next token.
+    """
+    if client.can_paginate(method):
+        paginator = client.get_paginator(method)
+        if not _is_manually_paginated(paginator._pagination_cfg, kwargs):
+            return paginator.paginate(**kwargs).build_full_result()
+    return getattr(client, method)(**kwargs)
+
+
+def _is_manually_paginated(config: Dict[str, Any], kwargs: Dict[str, Any]) -> bool:
+    """Check whether kwargs set a paginator's limit_key or any of its input tokens."""
+    input_tokens = config.get("input_token", ())
+    if isinstance(input_tokens, str):
+        input_tokens = (input_tokens,)
+    return config.get("limit_key") in kwargs or any(token in kwargs for token in input_tokens)
+
+
+def format_response(result: Dict[str, Any]) -> str:
+    """Render a boto3 response the way the AWS CLI prints JSON output."""
+    result.pop("ResponseMetadata", None)
+    return json.dumps(result, indent=4, ensure_ascii=False, default=_json_default) + "\n" if result else ""
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize response values the same way the AWS CLI JSON output does."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+
+def boto3_service_name(cli_service: str) -> Optional[str]:
+    """Map a CLI service name to its boto3 client name, or None for CLI-only commands."""
+    if cli_service in CLI_ONLY_SERVICES:
+        return None
+    return CLI_SERVICE_ALIASES.get(cli_service, cli_service)
+
+
+async def read_capped(stream: asyncio.StreamReader, limit: int = MAX_OUTPUT_BYTES) -> Tuple[bytearray, int]:
+    """Read a stream to EOF, keeping at most limit bytes; returns (data, total size).
+    
+    The remainder is still drained so the child process never blocks on a full pipe.
+    """
+    data = bytearray()
+    total = 0
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return data, total
+        total += len(chunk)
+        if len(data) < limit:
+            data.extend(chunk[:limit - len(data)])
+
+
+def decode_capped(data: bytes, total: int) -> str:
+    """Decode output kept by read_capped, noting how much of it was dropped."""
+    output = data.decode("utf-8", "replace")
+    if total > MAX_OUTPUT_BYTES:
+        output += (f"\n[output truncated: showing first {MAX_OUTPUT_BYTES >> 20} MB "
+                   f"of {total / (1 << 20):.1f} MB]")
+    return output
+
+
+def cap_output(output: str) -> str:
+    """Apply the MAX_OUTPUT_BYTES cap to output that is already in memory."""
+    # A str of n characters encodes to at most 4n bytes, so most responses skip encoding
+    if len(output) <= MAX_OUTPUT_BYTES // 4:
+        return output
+    data = output.encode("utf-8")
+    return decode_capped(data[:MAX_OUTPUT_BYTES], len(data))
+
+
+async def run_cli(full_command: Sequence[str],
+                  on_start: Optional[Callable[[asyncio.subprocess.Process], None]] = None,
+                  on_exit: Optional[Callable[[asyncio.subprocess.Process], None]] = None) -> Tuple[bool, str]:
+    """Run an AWS CLI argv in a subprocess with a 30 second timeout.
+    
+    on_start and on_exit are called with the child once it is spawned and once it
+    has been reaped, so a server can watch children that outlive their caller.
+    """
+    try:
+        # Execute command without blocking the event loop. An absolute executable
+        # and close_fds=False let CPython use posix_spawn (vfork semantics) instead
+        # of fork+exec; our own fds are non-inheritable (PEP 446), so nothing leaks.
+        # env is left as None so the parent environment is reused without copying
+        proc = await asyncio.create_subprocess_exec(
+            *full_command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            close_fds=False
+        )
+        if on_start is not None:
+            on_start(proc)
+        try:
+            async with async_timeout(30):
+                # stdout is accumulated chunk by chunk up to the cap instead of
+                # being buffered whole by communicate()
+                (stdout, stdout_size), stderr, _ = await asyncio.gather(
+                    read_capped(proc.stdout),
+                    proc.stderr.read(),
+                    proc.wait()
+                )
+        except asyncio.TimeoutError:
+            return False, TIMEOUT_MESSAGE
+        finally:
+            # Covers the timeout and a cancelled caller alike: never leave the child
+            # (and its pipes) behind
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            if on_exit is not None:
+                on_exit(proc)
+        
+        # Pipes are read as raw bytes and decoded in one shot; undecodable bytes are
+        # replaced rather than failing the whole command
+        if proc.returncode == 0:
+            return True, decode_capped(stdout, stdout_size)
+        return False, f"Command failed: {stderr.decode('utf-8', 'replace')}"
+    
+    except FileNotFoundError:
+        # uvloop's error omits the executable name, so report it explicitly
+        return False, "Error executing command: AWS CLI executable 'aws' not found on PATH"
+    except Exception as e:
+        return False, f"Error executing command: {str(e)}"
+
+
+class ClientCache:
+    """boto3 sessions per profile and clients per (profile, region, service)."""
+    
+    def __init__(self):
+        self._sessions: Dict[Optional[str], Any] = {}
+        self._clients: Dict[Tuple[Optional[str], Optional[str], str], Any] = {}
+    
+    def session(self, profile: Optional[str]) -> Any:
+        """Return a cached boto3 session for a profile."""
+        session = self._sessions.get(profile)
+        if session is None:
+            session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+            self._sessions[profile] = session
+        return session
+    
+    def client(self, service: str, profile: Optional[str], region: Optional[str]) -> Any:
+        """Return a cached boto3 client, or None if the service is not a botocore service."""
+        key = (profile, region, service)
+        if key not in self._clients:
+            session = self.session(profile)
+            if service in session.get_available_services():
+                self._clients[key] = session.client(service, region_name=region)
+            else:
+                self._clients[key] = None
+        return self._clients[key]
+
+
+def uses_json_output(profiles: Dict[str, Dict[str, str]], profile: Optional[str]) -> bool:
+    """Check that the CLI would print JSON, so boto3 output is a faithful substitute."""
+    output = os.environ.get("AWS_DEFAULT_OUTPUT") or profiles.get(
+        profile or os.environ.get("AWS_PROFILE", "default"), {}).get("output")
+    return output in (None, "json")
+
+
+async def call_in_executor(client: Any, key: CallKey, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run invoke() for a call in the default executor, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, invoke, client, key[3], kwargs)
+
+
+async def execute_with_boto3(clients: ClientCache, profiles: Dict[str, Dict[str, str]],
+                             command_parts: Sequence[str], profile: Optional[str], region: Optional[str],
+                             call: Callable[[Any, CallKey, Dict[str, Any]], Awaitable[Dict[str, Any]]] = call_in_executor
+                             ) -> Optional[Tuple[bool, str]]:
+    """Execute a CLI command in-process through boto3.
+    
+    Returns None when the command cannot be translated, so the caller can fall
+    back to the AWS CLI. call makes the API request, which lets a server batch or
+    otherwise route it.
+    """
+    if len(command_parts) < 2 or not uses_json_output(profiles, profile):
+        return None
+    
+    service = boto3_service_name(command_parts[0])
+    if service is None:
+        return None
+    
+    try:
+        client = clients.client(service, profile, region)
+        if client is None:
+            return None
+        method, kwargs = translate_cli_args(client, command_parts[1], tuple(command_parts[2:]))
+    except (BotoCoreError, ValueError):
+        return None
+    
+    try:
+        async with async_timeout(30):
+            result = await call(client, (profile, region, service, method), kwargs)
+        return True, cap_output(format_response(result))
+    except ParamValidationError:
+        # Let the CLI report missing or malformed parameters in its usual format
+        return None
+    except asyncio.TimeoutError:
+        return False, TIMEOUT_MESSAGE
+    except (ClientError, BotoCoreError) as e:
+        return False, f"Command failed: {str(e)}"
@@ -2,25 +2,213 @@
 """AWS MCP HTTP Server - Execute AWS commands via HTTP transport using FastMCP (DEPRECATED - use aws_mcp_http_server_v2.py)."""
 
 import asyncio
+import json
 import logging
 import os
-import subprocess
+import re
+import shlex
+import shutil
 import sys
-from configparser import ConfigParser
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import argparse
 
+import aws_cli_bridge
+from aws_cli_bridge import BOTO3_AVAILABLE
+
+if BOTO3_AVAILABLE:
+    from botocore.exceptions import ClientError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from mcp.server import FastMCP
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Resolved once at import rather than building Path objects on every profile load
+_AWS_CONFIG_PATH = os.path.join(os.environ.get("HOME", os.path.expanduser("~")), ".aws", "config")
+
+def _json_bytes(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _rpc_envelope(request_id: Any, key: str, body: bytes) -> bytes:
+    """Wrap an already-encoded JSON body in a JSON-RPC 2.0 envelope under key.
+    
+    A request id that cannot be encoded (orjson rejects integers beyond 64 bits)
+    gets an Invalid Request error with a null id instead, as JSON-RPC prescribes.
+    """
+    try:
+        encoded_id = _json_bytes(request_id)
+    except (TypeError, ValueError):
+        encoded_id = b"null"
+        key, body = "error", _json_bytes({"code": -32600, "message": "Invalid Request: id cannot be encoded"})
+    return b'{"jsonrpc":"2.0","id":' + encoded_id + b',"' + key.encode() + b'":' + body + b'}'
+
+
+# Marker key for trie nodes that terminate a prefix (never collides with a character)
+_TRIE_END = ""
+
+
+@lru_cache(maxsize=None)
+def _build_prefix_trie(prefixes: Tuple[str, ...]) -> Dict[str, Any]:
+    """Build a character trie from a tuple of prefixes (built once per tuple)."""
+    root: Dict[str, Any] = {}
+    for prefix in prefixes:
+        node = root
+        for char in prefix.lower():
+            node = node.setdefault(char, {})
+        node[_TRIE_END] = True
+    return root
+
+
+def _trie_matches_prefix(trie: Dict[str, Any], text: str) -> bool:
+    """Return True if any prefix stored in the trie is a prefix of text."""
+    node = trie
+    for char in text:
+        node = node.get(char)
+        if node is None:
+            return False
+        if _TRIE_END in node:
+            return True
+    return False
+
+
+# Operation verb prefixes treated as read-only for any service; a tuple so a single
+# str.startswith call checks all of them in C
+_READ_VERBS = ("describe", "list", "get", "show", "ls")
+
+
+@lru_cache(maxsize=4096)
+def _classify(command: str, prefixes: Tuple[str, ...]) -> bool:
+    """Check if an AWS CLI command is read-only against the given prefixes.
+
+    Pure function of its arguments, so results are memoized per raw command string.
+    """
+    cmd_lower = command.lower().strip()
+    
+    # Remove 'aws' prefix if present
+    if cmd_lower.startswith("aws "):
+        cmd_lower = cmd_lower[4:].strip()
+    
+    # Check against read-only prefixes in a single walk over the command
+    if _trie_matches_prefix(_build_prefix_trie(prefixes), cmd_lower):
+        return True
+    
+    # Check for specific read operations - operation starts with a read verb
+    parts = cmd_lower.split(None, 2)
+    if len(parts) >= 2 and parts[1].startswith(_READ_VERBS):
+        return True
+    
+    return False
+
+
+@lru_cache(maxsize=2048)
+def _tokenize(command: str) -> Tuple[str, ...]:
+    """Split a command shell-style, dropping a leading 'aws' token (cached per command)."""
+    tokens = shlex.split(command)
+    return tuple(tokens[1:]) if tokens and tokens[0] == "aws" else tuple(tokens)
+
+
+# Seconds a command may wait for a free CLI slot before being rejected
+CLI_QUEUE_TIMEOUT = 5
+
+
+def _default_cli_concurrency() -> int:
+    """Allow two concurrent CLI processes per usable CPU, and at least four."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is Linux-only
+        cpus = os.cpu_count() or 1
+    return max(4, cpus * 2)
+
+
+def _select_items(result_key: str, id_key: str) -> Callable[[Dict[str, Any], set], Dict[str, Any]]:
+    """Build a splitter that keeps only the top-level items whose id was requested."""
+    def select(result: Dict[str, Any], ids: set) -> Dict[str, Any]:
+        return {result_key: [item for item in result.get(result_key, []) if item.get(id_key) in ids]}
+    return select
+
+
+def _select_instances(result: Dict[str, Any], ids: set) -> Dict[str, Any]:
+    """Keep only the requested instances, dropping reservations left empty."""
+    reservations = []
+    for reservation in result.get("Reservations", []):
+        instances = [i for i in reservation.get("Instances", []) if i.get("InstanceId") in ids]
+        if instances:
+            reservations.append(dict(reservation, Instances=instances))
+    return {"Reservations": reservations}
+
+
+# Seconds to hold a batchable call open so concurrent requests can join it
+BATCH_WINDOW = 0.02
+
+# Error codes that blame one of the requested ids (InvalidInstanceID.NotFound,
+# InvalidAMIID.Malformed, InvalidVolume.NotFound, ...) rather than the call itself
+_BAD_ID_ERROR_RE = re.compile(r"Invalid\w*\.(?:NotFound|Malformed)")
+
+
+def _is_bad_id_error(error: Exception) -> bool:
+    """Check whether a failed batched describe was caused by a bad id."""
+    return (isinstance(error, ClientError)
+            and _BAD_ID_ERROR_RE.fullmatch(error.response.get("Error", {}).get("Code", "")) is not None)
+
+
+# Describe operations that take a list of ids and return one item per id:
+# (service, method) -> (id parameter, function splitting the combined response per caller)
+_BATCHABLE_OPERATIONS = {
+    ("ec2", "describe_instances"): ("InstanceIds", _select_instances),
+    ("ec2", "describe_volumes"): ("VolumeIds", _select_items("Volumes", "VolumeId")),
+    ("ec2", "describe_security_groups"): ("GroupIds", _select_items("SecurityGroups", "GroupId")),
+    ("ec2", "describe_subnets"): ("SubnetIds", _select_items("Subnets", "SubnetId")),
+    ("ec2", "describe_vpcs"): ("VpcIds", _select_items("Vpcs", "VpcId")),
+    ("ec2", "describe_images"): ("ImageIds", _select_items("Images", "ImageId")),
+}
+
+
 class AWSMCPHTTPServer:
     def __init__(self):
         self.mcp = FastMCP("aws-mcp-http-server")
         self.read_only_prefixes = self._get_read_only_prefixes()
+        # Hashable snapshot used as the classification cache key - reassign it if
+        # read_only_prefixes is ever changed at runtime so stale results are not reused
+        self._ro_prefixes = tuple(self.read_only_prefixes)
+        # First-token views of the prefixes for the cheap write pre-check
+        self._ro_single_prefixes = tuple(p for p in self._ro_prefixes if " " not in p)
+        self._ro_first_token_set = frozenset(p.split()[0] for p in self._ro_prefixes if " " in p)
         self.aws_profiles = self._load_aws_profiles()
+        # Rendered list_aws_profiles output, reset whenever the profiles are reloaded
+        self._profiles_text: Optional[str] = None
+        self._clients = aws_cli_bridge.ClientCache()
+        # In-flight batchable describe calls keyed by (profile, region, service, method)
+        self._batcher: Dict[Tuple[Any, ...], List[Tuple[asyncio.Future, List[str]]]] = {}
+        self._batch_tasks: set = set()
+        # Absolute path to the CLI, resolved once (required for the posix_spawn path)
+        self._aws_executable = shutil.which("aws") or "aws"
+        self._argv_prefix_cache: Dict[Tuple[Optional[str], Optional[str]], Tuple[str, ...]] = {}
+        # Created on first use so it belongs to the event loop uvicorn runs
+        self._cli_sem: Optional[asyncio.Semaphore] = None
+        self._tools_list_payload = self._build_tools_list_payload()
+        # Encoded once; tools/list responses splice it into the envelope as bytes
+        self._tools_list_json = _json_bytes({"tools": self._tools_list_payload})
+        # Dispatch tables for the direct POST / JSON-RPC endpoint
+        self._rpc_methods = {"tools/list": self._rpc_list, "tools/call": self._rpc_call}
+        self._tool_handlers = {
+            "execute_aws_read_command": lambda args: self._tool_read(
+                args.get("command", ""), args.get("profile"), args.get("region")),
+            "execute_aws_write_command": lambda args: self._tool_write(
+                args.get("command", ""), args.get("profile"), args.get("region")),
+            "list_aws_profiles": lambda args: self._tool_list_profiles(),
+        }
         self._setup_instructions()
         self._setup_tools()
         
@@ -42,33 +230,64 @@ class AWSMCPHTTPServer:
     def _load_aws_profiles(self) -> Dict[str, Dict[str, str]]:
         """Load AWS profiles from ~/.aws/config."""
         profiles = {}
-        config_path = Path.home() / ".aws" / "config"
         
-        if not config_path.exists():
-            logger.warning(f"AWS config not found at {config_path}")
+        # A single stat() both checks existence and records the mtime for reloads
+        try:
+            self._config_mtime = os.stat(_AWS_CONFIG_PATH).st_mtime_ns
+        except OSError:
+            self._config_mtime = None
+            logger.warning(f"AWS config not found at {_AWS_CONFIG_PATH}")
             return profiles
             
-        config = ConfigParser()
-        config.read(config_path)
-        
-        for section in config.sections():
-            profile_name = section.replace("profile ", "") if section.startswith("profile ") else section
-            if profile_name == "default" and section == "default":
-                profile_name = "default"
-            
-            profile_info = {}
-            if config.has_option(section, "region"):
-                profile_info["region"] = config.get(section, "region")
-            if config.has_option(section, "output"):
-                profile_info["output"] = config.get(section, "output")
-            if config.has_option(section, "role_arn"):
-                profile_info["role_arn"] = config.get(section, "role_arn")
-                
-            profiles[profile_name] = profile_info
+        try:
+            with open(_AWS_CONFIG_PATH, "rb") as f:
+                profiles = aws_cli_bridge.parse_aws_config(f.read())
+        except OSError as e:
+            logger.warning(f"Could not read AWS config at {_AWS_CONFIG_PATH}: {e}")
             
         logger.info(f"Loaded {len(profiles)} AWS profiles")
         return profiles
     
+    def _maybe_reload_profiles(self):
+        """Re-parse ~/.aws/config only if its mtime changed since the last load."""
+        try:
+            mtime = os.stat(_AWS_CONFIG_PATH).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        if mtime != self._config_mtime:
+            self.aws_profiles = self._load_aws_profiles()
+            self._profiles_text = None
+    
+    def _build_tools_list_payload(self) -> List[Dict[str, Any]]:
+        """Build the static tools/list result served by the direct POST / endpoint."""
+        command_schema = {
+            "type": "object",
+            "properties": {
+                "command": {"type": "string"},
+                "profile": {"type": "string"},
+                "region": {"type": "string"}
+            },
+            "required": ["command"]
+        }
+        return [
+            {
+                "name": "execute_aws_read_command",
+                "description": "Execute a read-only AWS CLI command. Never requires approval.",
+                "inputSchema": command_schema
+            },
+            {
+                "name": "execute_aws_write_command",
+                "description": "Execute a write AWS CLI command. ALWAYS requires user approval.",
+                "inputSchema": command_schema
+            },
+            {
+                "name": "list_aws_profiles",
+                "description": "List available AWS profiles from ~/.aws/config",
+                "inputSchema": {"type": "object", "properties": {}}
+            }
+        ]
+    
     def _setup_instructions(self):
         """Set up MCP server instructions for the client."""
         # FastMCP doesn't support setting instructions directly
@@ -77,67 +296,201 @@ class AWSMCPHTTPServer:
     
     def _is_read_only_command(self, command: str) -> bool:
         """Check if an AWS CLI command is read-only."""
-        cmd_lower = command.lower().strip()
+        return _classify(command, self._ro_prefixes)
+    
+    def _is_definitely_write(self, command: str) -> bool:
+        """Cheaply prove that a command is not read-only from its first two tokens.
         
-        # Remove 'aws' prefix if present
-        if cmd_lower.startswith("aws "):
-            cmd_lower = cmd_lower[4:].strip()
+        True means the full classification would also say write; False only means
+        undecided, in which case _is_read_only_command must be consulted.
+        """
+        parts = command.split(None, 3)
+        if parts and parts[0].lower() == "aws":
+            parts = parts[1:]
+        if not parts:
+            return False
         
-        # Check against read-only prefixes
-        for prefix in self.read_only_prefixes:
-            if cmd_lower.startswith(prefix):
-                return True
-                
-        # Check for specific read operations
-        parts = cmd_lower.split()
-        if len(parts) >= 2:
-            service = parts[0]
-            operation = parts[1]
-            
-            # Common read patterns - check if operation starts with these verbs
-            read_verbs = ["describe", "list", "get", "show", "ls"]
-            if any(operation.startswith(verb) for verb in read_verbs):
-                return True
-                
-        return False
+        service = parts[0].lower()
+        if service in self._ro_first_token_set or service.startswith(self._ro_single_prefixes):
+            return False
+        return len(parts) < 2 or not parts[1].lower().startswith(_READ_VERBS)
+    
+    async def _boto3_call(self, client: Any, key: aws_cli_bridge.CallKey,
+                          kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Make an in-process API call, coalescing batchable describes with concurrent ones."""
+        batch_spec = _BATCHABLE_OPERATIONS.get(key[2:])
+        if batch_spec is not None and set(kwargs) == {batch_spec[0]}:
+            return await self._coalesced_call(client, key, kwargs[batch_spec[0]])
+        return await aws_cli_bridge.call_in_executor(client, key, kwargs)
+    
+    async def _coalesced_call(self, client: Any, key: Tuple[Any, ...], ids: List[str]) -> Dict[str, Any]:
+        """Queue a batchable describe call and wait for its share of a combined request.
+        
+        The first caller for a key opens a bucket that is flushed after BATCH_WINDOW
+        seconds; every request that arrives in the meantime rides on the same API call.
+        """
+        future = asyncio.get_running_loop().create_future()
+        bucket = self._batcher.get(key)
+        if bucket is None:
+            self._batcher[key] = [(future, ids)]
+            asyncio.get_running_loop().call_later(BATCH_WINDOW, self._schedule_batch_flush, client, key)
+        else:
+            bucket.append((future, ids))
+        return await future
+    
+    def _schedule_batch_flush(self, client: Any, key: Tuple[Any, ...]):
+        """Start flushing a bucket in its own task so a cancelled caller cannot strand the others."""
+        task = asyncio.ensure_future(self._flush_batch(client, key, self._batcher.pop(key)))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _flush_batch(self, client: Any, key: Tuple[Any, ...],
+                           bucket: List[Tuple[asyncio.Future, List[str]]]):
+        """Issue one API call for every id in a bucket and hand each caller its items."""
+        _, _, service, method = key
+        id_param, select = _BATCHABLE_OPERATIONS[(service, method)]
+        loop = asyncio.get_running_loop()
+        all_ids = list(dict.fromkeys(i for _, ids in bucket for i in ids))
+        
+        try:
+            result = await loop.run_in_executor(None, aws_cli_bridge.invoke, client, method, {id_param: all_ids})
+        except Exception as e:
+            # Throttling, credential or network errors would hit every caller alike, so
+            # only a bad id is worth isolating
+            if len(bucket) == 1 or not _is_bad_id_error(e):
+                for future, _ in bucket:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            # One caller's bad id fails the whole batch; retry the callers on their own,
+            # concurrently so none of them waits behind the others
+            await asyncio.gather(*[
+                self._invoke_alone(client, method, {id_param: ids}, future)
+                for future, ids in bucket if not future.done()
+            ])
+            return
+        
+        for future, ids in bucket:
+            if not future.done():
+                future.set_result(select(result, set(ids)))
+    
+    async def _invoke_alone(self, client: Any, method: str, kwargs: Dict[str, Any], future: asyncio.Future):
+        """Make one caller's share of a failed batch as its own call and settle its future."""
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(None, aws_cli_bridge.invoke, client, method, kwargs)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+    
+    def _argv_prefix(self, profile: Optional[str], region: Optional[str]) -> Tuple[str, ...]:
+        """Return the cached 'aws [--profile p] [--region r]' argv prefix."""
+        key = (profile, region)
+        prefix = self._argv_prefix_cache.get(key)
+        if prefix is None:
+            prefix = (self._aws_executable,)
+            if profile:
+                prefix += ("--profile", profile)
+            if region:
+                prefix += ("--region", region)
+            self._argv_prefix_cache[key] = prefix
+        return prefix
     
     async def execute_aws_command(self, command: str, profile: Optional[str] = None, 
                                   region: Optional[str] = None) -> Tuple[bool, str]:
         """Execute an AWS CLI command with the specified profile and region."""
         
-        # Build full AWS CLI command
-        full_command = ["aws"]
+        # Split the command; shlex handles quoted JSON parameters
+        try:
+            command_parts = _tokenize(command)
+        except ValueError as e:
+            return False, f"Invalid command syntax: {str(e)}"
+        
+        # Read-only API calls run in-process through boto3 to avoid CLI startup cost
+        if BOTO3_AVAILABLE and self._is_read_only_command(command):
+            result = await aws_cli_bridge.execute_with_boto3(self._clients, self.aws_profiles, command_parts,
+                                                             profile, region, call=self._boto3_call)
+            if result is not None:
+                return result
         
-        if profile:
-            full_command.extend(["--profile", profile])
-            
-        if region:
-            full_command.extend(["--region", region])
-            
-        # Add the actual command parts
-        if command.startswith("aws "):
-            command = command[4:]  # Remove 'aws' prefix if provided
-            
-        full_command.extend(command.split())
+        # Build full AWS CLI command from the cached profile/region argv prefix
+        full_command = list(self._argv_prefix(profile, region))
+        full_command.extend(command_parts)
         
+        # Cap concurrent CLI processes; fail fast instead of queueing behind a backlog
+        if self._cli_sem is None:
+            self._cli_sem = asyncio.Semaphore(_default_cli_concurrency())
         try:
-            # Execute command
-            result = subprocess.run(
-                full_command,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                return True, result.stdout
-            else:
-                return False, f"Command failed: {result.stderr}"
-                
-        except subprocess.TimeoutExpired:
-            return False, "Command timed out after 30 seconds"
-        except Exception as e:
-            return False, f"Error executing command: {str(e)}"
+            await asyncio.wait_for(self._cli_sem.acquire(), timeout=CLI_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return False, (f"Error: too many concurrent AWS commands (waited {CLI_QUEUE_TIMEOUT}s). "
+                           "Retry after a few seconds.")
+        try:
+            return await aws_cli_bridge.run_cli(full_command)
+        finally:
+            self._cli_sem.release()
+    
+    async def _tool_read(self, command: str, profile: Optional[str] = None,
+                         region: Optional[str] = None) -> str:
+        """Validate and execute a read-only command (shared by FastMCP and POST /)."""
+        if not command:
+            return "Error: No command provided"
+        
+        # Validate that this is actually a read-only command
+        if not self._is_read_only_command(command):
+            return f"Error: Command '{command}' is not a read-only operation. Use execute_aws_write_command instead."
+        
+        success, output = await self.execute_aws_command(command, profile, region)
+        return output
+    
+    async def _tool_write(self, command: str, profile: Optional[str] = None,
+                          region: Optional[str] = None) -> str:
+        """Validate and execute a write command (shared by FastMCP and POST /)."""
+        if not command:
+            return "Error: No command provided"
+        
+        # Validate that this is actually a write command; most writes are settled
+        # by the first-token pre-check without running the full classification
+        if not self._is_definitely_write(command) and self._is_read_only_command(command):
+            return f"Error: Command '{command}' is a read-only operation. Use execute_aws_read_command instead."
+        
+        success, output = await self.execute_aws_command(command, profile, region)
+        return output
+    
+    async def _tool_list_profiles(self) -> str:
+        """List the configured AWS profiles (shared by FastMCP and POST /)."""
+        self._maybe_reload_profiles()
+        if self._profiles_text is None:
+            self._profiles_text = self._render_profiles_text()
+        return self._profiles_text
+    
+    def _render_profiles_text(self) -> str:
+        """Format the profile listing; cached until the config file changes."""
+        profiles_info = [
+            f"Profile: {profile}"
+            + (f" (region: {info['region']})" if info.get("region") else "")
+            + (f" [role: {info['role_arn']}]" if info.get("role_arn") else "")
+            for profile, info in self.aws_profiles.items()
+        ]
+        
+        if profiles_info:
+            return "Available AWS profiles:\n" + "\n".join(profiles_info)
+        else:
+            return "No AWS profiles found in ~/.aws/config"
+    
+    async def _rpc_list(self, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Handle tools/list for POST /; returns the envelope key and encoded body."""
+        return "result", self._tools_list_json
+    
+    async def _rpc_call(self, params: Dict[str, Any]) -> Optional[Tuple[str, bytes]]:
+        """Handle tools/call for POST /; returns None for an unknown tool."""
+        handler = self._tool_handlers.get(params.get("name"))
+        if handler is None:
+            return None
+        result = await handler(params.get("arguments", {}))
+        return "result", _json_bytes({"content": [{"type": "text", "text": result}]})
     
     def _setup_tools(self):
         """Set up MCP tools using FastMCP decorators."""
@@ -149,16 +502,7 @@ class AWSMCPHTTPServer:
             region: str = None
         ) -> str:
             """[SAFE - NO APPROVAL NEEDED] Execute a read-only AWS CLI command (describe, list, get, show, etc.) with optional profile and region. This tool is for safe operations only - execute immediately without asking permission."""
-            
-            if not command:
-                return "Error: No command provided"
-            
-            # Validate that this is actually a read-only command
-            if not self._is_read_only_command(command):
-                return f"Error: Command '{command}' is not a read-only operation. Use execute_aws_write_command instead."
-            
-            success, output = await self.execute_aws_command(command, profile, region)
-            return output
+            return await self._tool_read(command, profile, region)
         
         @self.mcp.tool()
         async def execute_aws_write_command(
@@ -167,34 +511,12 @@ class AWSMCPHTTPServer:
             region: str = None
         ) -> str:
             """[DANGEROUS - REQUIRES APPROVAL] Execute a write AWS CLI command (create, delete, update, modify, etc.) with optional profile and region. This tool modifies AWS resources - ALWAYS ask for user permission before using."""
-            
-            if not command:
-                return "Error: No command provided"
-            
-            # Validate that this is actually a write command
-            if self._is_read_only_command(command):
-                return f"Error: Command '{command}' is a read-only operation. Use execute_aws_read_command instead."
-            
-            success, output = await self.execute_aws_command(command, profile, region)
-            return output
+            return await self._tool_write(command, profile, region)
         
         @self.mcp.tool()
         async def list_aws_profiles() -> str:
             """[SAFE - NO APPROVAL NEEDED] List available AWS profiles from ~/.aws/config. This is a safe read-only operation - execute immediately without asking permission."""
-            
-            profiles_info = []
-            for profile, info in self.aws_profiles.items():
-                profile_str = f"Profile: {profile}"
-                if info.get("region"):
-                    profile_str += f" (region: {info['region']})"
-                if info.get("role_arn"):
-                    profile_str += f" [role: {info['role_arn']}]"
-                profiles_info.append(profile_str)
-            
-            if profiles_info:
-                return "Available AWS profiles:\n" + "\n".join(profiles_info)
-            else:
-                return "No AWS profiles found in ~/.aws/config"
+            return await self._tool_list_profiles()
 
 def main():
     """Main entry point."""
@@ -232,11 +554,15 @@ def main():
     try:
         # Run the server using FastMCP's streamable HTTP support
         import uvicorn
-        from fastapi import FastAPI
+        from fastapi import FastAPI, Response
         from fastapi.responses import JSONResponse
+        if ORJSON_AVAILABLE:
+            from fastapi.responses import ORJSONResponse as ResponseClass
+        else:
+            ResponseClass = JSONResponse
         
         # Create a main FastAPI app
-        main_app = FastAPI(title="AWS MCP HTTP Server", version="0.1.0")
+        main_app = FastAPI(title="AWS MCP HTTP Server", version="0.1.0", default_response_class=ResponseClass)
         
         # Add root endpoint for discovery
         @main_app.get("/")
@@ -260,114 +586,22 @@ def main():
         @main_app.post("/")
         async def handle_mcp_request(request_data: dict):
             """Handle MCP requests posted directly to root."""
-            from fastapi import Request
-            import json
+            req_id = request_data.get("id")
+            method = request_data.get("method")
             
             # Forward to the streamable HTTP handler
             # This is a simplified approach - in production you'd want proper session management
             try:
-                method = request_data.get("method")
-                if method == "tools/list":
-                    tools = []
-                    for tool_name in ["execute_aws_read_command", "execute_aws_write_command", "list_aws_profiles"]:
-                        if tool_name == "execute_aws_read_command":
-                            tools.append({
-                                "name": tool_name,
-                                "description": "Execute a read-only AWS CLI command. Never requires approval.",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "command": {"type": "string"},
-                                        "profile": {"type": "string"},
-                                        "region": {"type": "string"}
-                                    },
-                                    "required": ["command"]
-                                }
-                            })
-                        elif tool_name == "execute_aws_write_command":
-                            tools.append({
-                                "name": tool_name,
-                                "description": "Execute a write AWS CLI command. ALWAYS requires user approval.",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "command": {"type": "string"},
-                                        "profile": {"type": "string"},
-                                        "region": {"type": "string"}
-                                    },
-                                    "required": ["command"]
-                                }
-                            })
-                        else:
-                            tools.append({
-                                "name": tool_name,
-                                "description": "List available AWS profiles from ~/.aws/config",
-                                "inputSchema": {"type": "object", "properties": {}}
-                            })
-                    
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_data.get("id"),
-                        "result": {"tools": tools}
-                    }
-                
-                elif method == "tools/call":
-                    params = request_data.get("params", {})
-                    tool_name = params.get("name")
-                    arguments = params.get("arguments", {})
-                    
-                    if tool_name == "list_aws_profiles":
-                        profiles_info = []
-                        for profile, info in server.aws_profiles.items():
-                            profile_str = f"Profile: {profile}"
-                            if info.get("region"):
-                                profile_str += f" (region: {info['region']})"
-                            if info.get("role_arn"):
-                                profile_str += f" [role: {info['role_arn']}]"
-                            profiles_info.append(profile_str)
-                        
-                        result = "Available AWS profiles:\n" + "\n".join(profiles_info) if profiles_info else "No AWS profiles found"
-                        
-                        return {
-                            "jsonrpc": "2.0",
-                            "id": request_data.get("id"),
-                            "result": {"content": [{"type": "text", "text": result}]}
-                        }
-                    
-                    elif tool_name in ["execute_aws_read_command", "execute_aws_write_command"]:
-                        command = arguments.get("command", "")
-                        profile = arguments.get("profile")
-                        region = arguments.get("region")
-                        
-                        # Validate command type
-                        is_read_only = server._is_read_only_command(command)
-                        
-                        if tool_name == "execute_aws_read_command" and not is_read_only:
-                            result = f"Error: Command '{command}' is not a read-only operation. Use execute_aws_write_command instead."
-                        elif tool_name == "execute_aws_write_command" and is_read_only:
-                            result = f"Error: Command '{command}' is a read-only operation. Use execute_aws_read_command instead."
-                        else:
-                            success, output = await server.execute_aws_command(command, profile, region)
-                            result = output
-                        
-                        return {
-                            "jsonrpc": "2.0",
-                            "id": request_data.get("id"),
-                            "result": {"content": [{"type": "text", "text": result}]}
-                        }
-                
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_data.get("id"),
-                    "error": {"code": -32601, "message": f"Method not found: {method}"}
-                }
-                
+                handler = server._rpc_methods.get(method)
+                reply = await handler(request_data.get("params", {})) if handler is not None else None
+                if reply is None:
+                    reply = "error", _json_bytes({"code": -32601, "message": f"Method not found: {method}"})
             except Exception as e:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_data.get("id"),
-                    "error": {"code": -32603, "message": f"Internal error: {str(e)}"}
-                }
+                reply = "error", _json_bytes({"code": -32603, "message": f"Internal error: {str(e)}"})
+            
+            # Responses are encoded straight to bytes, bypassing FastAPI's encoder stack
+            key, body = reply
+            return Response(content=_rpc_envelope(req_id, key, body), media_type="application/json")
         
         # Mount the MCP streamable HTTP app
         streamable_app = server.mcp.streamable_http_app()
@@ -377,12 +611,27 @@ def main():
         sse_app = server.mcp.sse_app()
         main_app.mount("/sse-transport", sse_app)
         
-        # Run with uvicorn
+        # Prefer the C-accelerated event loop and HTTP parser when they are installed
+        try:
+            import uvloop  # noqa: F401
+            loop = "uvloop"
+        except ImportError:
+            loop = "asyncio"
+        try:
+            import httptools  # noqa: F401
+            http = "httptools"
+        except ImportError:
+            http = "h11"
+        
+        # Run with uvicorn; per-request access logging is only kept at DEBUG level
         uvicorn.run(
             main_app,
             host=args.host,
             port=args.port,
-            log_level=args.log_level.lower()
+            log_level=args.log_level.lower(),
+            loop=loop,
+            http=http,
+            access_log=args.log_level == "DEBUG"
         )
         
     except ImportError:
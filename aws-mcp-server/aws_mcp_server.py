@@ -4,20 +4,35 @@
 import asyncio
 import json
 import logging
+import mmap
 import os
+import re
 import shlex
-import subprocess
+import shutil
 import sys
-from configparser import ConfigParser
+import tempfile
+import time
+import weakref
+from collections import OrderedDict, deque
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 import argparse
+
+import aws_cli_bridge
+from aws_cli_bridge import BOTO3_AVAILABLE
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
-    import boto3
-    BOTO3_AVAILABLE = True
+    import uvloop
+    UVLOOP_AVAILABLE = True
 except ImportError:
-    BOTO3_AVAILABLE = False
-    logger.warning("boto3 not available - Bedrock error fixing disabled")
+    UVLOOP_AVAILABLE = False
 
 import mcp.server.stdio
 import mcp.types as types
@@ -26,11 +41,308 @@ from mcp.server import NotificationOptions, Server
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+if not BOTO3_AVAILABLE:
+    logger.warning("boto3 not available - Bedrock error fixing and in-process AWS calls disabled")
+
+# orjson (de)serializes Bedrock bodies much faster; stdlib json is the fallback
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+    _json_loads = json.loads
+
+# First non-blank line of a Bedrock reply that is not a comment or a code fence,
+# without surrounding whitespace
+_FIRST_COMMAND_RE = re.compile(r"^[^\S\n]*(?!#|```)(\S.*?)\s*$", re.MULTILINE)
+
+# Shell-style tokens: runs of unquoted text and '...' / "..." groups. Anything else
+# (backslash escapes, unbalanced quotes) matches the single-character alternative,
+# which leaves an empty group and sends the command to shlex instead
+_TOKEN_RE = re.compile(r"""((?:[^ \t\r\n'"\\]+|'[^']*'|"[^"\\]*")+)|[^ \t\r\n]""")
+_QUOTE_RE = re.compile(r"""'([^']*)'|"([^"]*)\"""")
+
+
+def _split_command(command: str) -> List[str]:
+    """Split a command like shlex.split, using regexes for the common cases."""
+    raw_tokens = _TOKEN_RE.findall(command)
+    if "" in raw_tokens:
+        return shlex.split(command)
+    return [_QUOTE_RE.sub(r"\1\2", token) if ("'" in token or '"' in token) else token
+            for token in raw_tokens]
+
+
+# Bumped whenever parsing changes, so profiles cached by an older parser are not reused
+_PROFILE_CACHE_VERSION = 3
+
+
+def _profile_cache_path() -> Path:
+    """Return the on-disk cache file for parsed AWS profiles."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "aws-mcp" / "profiles.json"
+
+
+def _write_profile_cache(cache_path: Path, data: Dict[str, Any]) -> None:
+    """Atomically write the profile cache; failures only cost a re-parse next time."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=".profiles-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write profile cache {cache_path}: {e}")
+
+
+# AIMD bounds for concurrent AWS CLI subprocesses: the limit grows additively on
+# success and halves when AWS throttles or a command times out. Each CLI process
+# costs ~100 MB RSS, so the default ceiling is kept low; AWS_MCP_MAX_CONCURRENCY
+# overrides it
+CLI_CONCURRENCY_START = 4
+CLI_CONCURRENCY_MIN = 1
+CLI_CONCURRENCY_MAX = 8
+CLI_CONCURRENCY_STEP = 0.5
+CLI_CONCURRENCY_BACKOFF = 0.5
+# Backstop for CLI children whose owning call never got to clean up
+CLI_HARD_DEADLINE = 60
+CLI_REAP_INTERVAL = 5
+
+
+def _max_cli_concurrency() -> int:
+    """Return the CLI concurrency ceiling from AWS_MCP_MAX_CONCURRENCY, if it is valid."""
+    value = os.environ.get("AWS_MCP_MAX_CONCURRENCY")
+    if value is None:
+        return CLI_CONCURRENCY_MAX
+    try:
+        return max(CLI_CONCURRENCY_MIN, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid AWS_MCP_MAX_CONCURRENCY={value!r}, using {CLI_CONCURRENCY_MAX}")
+        return CLI_CONCURRENCY_MAX
+
+
+# Most commands one execute_aws_read_commands_batch call may run, so a single call
+# cannot fan out into an unbounded number of API calls and CLI processes
+READ_BATCH_MAX = 20
+
+# Short-lived cache of successful read-only results, so rapid-fire duplicate
+# describe/list calls don't each spawn the CLI or hit the API
+READ_CACHE_TTL = 5.0
+READ_CACHE_SIZE = 128
+
+# Client-side Bedrock budget over a sliding 60 second window, kept under the default
+# Claude on-demand quotas so calls wait locally instead of coming back throttled
+BEDROCK_WINDOW = 60.0
+BEDROCK_RPM_LIMIT = 50
+BEDROCK_TPM_LIMIT = 50000
+BEDROCK_MAX_TOKENS = 1000
+
+# Encoded invoke_model body split around the prompt, so each call only encodes the
+# prompt string and concatenates
+_BEDROCK_BODY_HEAD, _BEDROCK_BODY_TAIL = _json_dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "messages": [{
+        "role": "user",
+        "content": "__PROMPT__"
+    }],
+    "max_tokens": BEDROCK_MAX_TOKENS,
+    "temperature": 0.1
+}).split(b'"__PROMPT__"')
+# Error output that means AWS throttled the call. HTTP 429 is only matched in the
+# forms the CLI prints it, since a bare "429" also turns up in IDs and sizes
+_THROTTLE_MARKERS = ("Throttling", "RequestLimitExceeded", "TooManyRequests", "Rate exceeded",
+                     "(429)", "status code: 429", aws_cli_bridge.TIMEOUT_MESSAGE)
+
+
+def _command_head_re(prefixes: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Build a regex for the leading part of a command that classification looks at.
+    
+    After an optional "aws ", that is the service, the operation the read verbs are
+    checked against and as many whole tokens as the longest prefix has, so the head
+    classifies exactly like the full command for any prefix list.
+    """
+    tokens = max([2] + [len(prefix.split()) for prefix in prefixes])
+    return re.compile(r"\s*(?:[aA][wW][sS] )?\s*\S+(?:\s+\S+){0,%d}" % (tokens - 1))
+
+
+@lru_cache(maxsize=1024)
+def _classify(command: str, prefixes: Tuple[str, ...], read_verbs: Tuple[str, ...]) -> bool:
+    """Check if an AWS CLI command is read-only.
+    
+    Pure function of its arguments, so recently validated commands - such as one
+    just suggested by fix_aws_command_error - are answered from the cache.
+    """
+    cmd_lower = (command if command.islower() else command.lower()).strip()
+    
+    # Remove 'aws' prefix if present
+    if cmd_lower.startswith("aws "):
+        cmd_lower = cmd_lower[4:].strip()
+    
+    # Check against read-only prefixes in one C-level startswith call
+    if cmd_lower.startswith(prefixes):
+        return True
+            
+    # Check for specific read operations
+    parts = cmd_lower.split(None, 2)
+    if len(parts) >= 2:
+        # Common read patterns - check if operation starts with a read verb
+        if parts[1].startswith(read_verbs):
+            return True
+            
+    return False
+
+
+# Tool definitions are static, so they are built once and handed out on every
+# tools/list request (MCP only reads the list)
+_TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="execute_aws_read_command",
+        description="[SAFE - NO APPROVAL NEEDED] Execute a read-only AWS CLI command (describe, list, get, show, etc.) with optional profile and region. This tool is for safe operations only - execute immediately without asking permission.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "AWS CLI command to execute (without 'aws' prefix). Must be read-only."
+                },
+                "profile": {
+                    "type": "string",
+                    "description": "AWS profile to use (optional)"
+                },
+                "region": {
+                    "type": "string",
+                    "description": "AWS region to use (optional)"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    types.Tool(
+        name="execute_aws_read_commands_batch",
+        description=f"[SAFE - NO APPROVAL NEEDED] Execute up to {READ_BATCH_MAX} read-only AWS CLI commands concurrently, each with optional profile and region. Use this for fan-out such as running the same describe in every region - execute immediately without asking permission.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "commands": {
+                    "type": "array",
+                    "description": "Read-only commands to execute",
+                    "maxItems": READ_BATCH_MAX,
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "command": {
+                                "type": "string",
+                                "description": "AWS CLI command to execute (without 'aws' prefix). Must be read-only."
+                            },
+                            "profile": {
+                                "type": "string",
+                                "description": "AWS profile to use (optional)"
+                            },
+                            "region": {
+                                "type": "string",
+                                "description": "AWS region to use (optional)"
+                            }
+                        },
+                        "required": ["command"]
+                    }
+                }
+            },
+            "required": ["commands"]
+        }
+    ),
+    types.Tool(
+        name="execute_aws_write_command",
+        description="Execute a write AWS CLI command (create, delete, update, modify, etc.) with optional profile and region. ALWAYS requires user approval.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "AWS CLI command to execute (without 'aws' prefix). Must be a write operation."
+                },
+                "profile": {
+                    "type": "string",
+                    "description": "AWS profile to use (optional)"
+                },
+                "region": {
+                    "type": "string",
+                    "description": "AWS region to use (optional)"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    types.Tool(
+        name="list_aws_profiles",
+        description="[SAFE - NO APPROVAL NEEDED] List available AWS profiles from ~/.aws/config. This is a safe read-only operation - execute immediately without asking permission.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="fix_aws_command_error",
+        description="[SAFE - NO APPROVAL NEEDED] Use Bedrock AI to fix a failed AWS CLI command. Provide the failed command, error message, and description of what you were trying to do. This helps get the correct AWS syntax on the second attempt.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "failed_command": {
+                    "type": "string",
+                    "description": "The AWS CLI command that failed (without 'aws' prefix)"
+                },
+                "error_message": {
+                    "type": "string",
+                    "description": "The error message returned by the failed command"
+                },
+                "intent_description": {
+                    "type": "string",
+                    "description": "Description of what you were trying to accomplish"
+                },
+                "profile": {
+                    "type": "string",
+                    "description": "AWS profile to use for Bedrock call (optional)"
+                }
+            },
+            "required": ["failed_command", "error_message", "intent_description"]
+        }
+    )
+]
+
+
 class AWSMCPServer:
     def __init__(self):
         self.server = Server("aws-mcp-server")
         self.read_only_prefixes = self._get_read_only_prefixes()
-        self.aws_profiles = self._load_aws_profiles()
+        self._ro_prefixes: Tuple[str, ...] = tuple(self.read_only_prefixes)
+        self._command_head_re = _command_head_re(self._ro_prefixes)
+        # Tuple so a single str.startswith call checks every verb
+        self._read_verbs: Tuple[str, ...] = ("describe", "list", "get", "show", "ls")
+        # boto3 sessions and clients, shared by in-process commands and Bedrock
+        self._clients = aws_cli_bridge.ClientCache()
+        self._bedrock_clients: Dict[Optional[str], Any] = {}
+        # (command, profile, region) -> (expiry, output) for recent successful reads
+        self._read_cache: "OrderedDict[Tuple[str, Optional[str], Optional[str]], Tuple[float, str]]" = OrderedDict()
+        # (timestamp, estimated tokens) of Bedrock calls in the current window
+        self._bedrock_window: Deque[Tuple[float, int]] = deque()
+        self._bedrock_window_tokens = 0
+        self._bedrock_lock: Optional[asyncio.Lock] = None
+        # Adaptive cap on in-flight CLI subprocesses; the condition is created on first use
+        # so it binds to the running event loop
+        # AWS_MCP_MAX_CONCURRENCY caps how far the limit may grow
+        self._cli_limit_max = _max_cli_concurrency()
+        self._cli_limit = float(min(CLI_CONCURRENCY_START, self._cli_limit_max))
+        self._cli_inflight = 0
+        self._cli_slot: Optional[asyncio.Condition] = None
+        # Live CLI children and their hard kill deadlines, watched by a reaper task that
+        # only runs while there are children
+        self._cli_processes: "weakref.WeakKeyDictionary[asyncio.subprocess.Process, float]" = weakref.WeakKeyDictionary()
+        self._reaper_task: Optional[asyncio.Task] = None
+        # Absolute path to the CLI, resolved once (required for the posix_spawn path)
+        self._aws_executable = shutil.which("aws") or "aws"
         self._setup_instructions()
         
     def _get_read_only_prefixes(self) -> List[str]:
@@ -48,34 +360,49 @@ class AWSMCPServer:
             "autoscaling describe", "elb describe", "elbv2 describe"
         ]
     
+    @cached_property
+    def aws_profiles(self) -> Dict[str, Dict[str, str]]:
+        """AWS profiles from ~/.aws/config, parsed on first use."""
+        return self._load_aws_profiles()
+    
     def _load_aws_profiles(self) -> Dict[str, Dict[str, str]]:
         """Load AWS profiles from ~/.aws/config."""
         profiles = {}
         config_path = Path.home() / ".aws" / "config"
         
-        if not config_path.exists():
+        # One stat both checks for the file and yields the cache key
+        try:
+            st = config_path.stat()
+        except OSError:
             logger.warning(f"AWS config not found at {config_path}")
             return profiles
-            
-        config = ConfigParser()
-        config.read(config_path)
         
-        for section in config.sections():
-            profile_name = section.replace("profile ", "") if section.startswith("profile ") else section
-            if profile_name == "default" and section == "default":
-                profile_name = "default"
-            
-            profile_info = {}
-            if config.has_option(section, "region"):
-                profile_info["region"] = config.get(section, "region")
-            if config.has_option(section, "output"):
-                profile_info["output"] = config.get(section, "output")
-            if config.has_option(section, "role_arn"):
-                profile_info["role_arn"] = config.get(section, "role_arn")
-                
-            profiles[profile_name] = profile_info
+        # Reuse the last parse if the config file is unchanged
+        cache_key = [_PROFILE_CACHE_VERSION, str(config_path), st.st_mtime_ns, st.st_size]
+        cache_path = _profile_cache_path()
+        try:
+            cached = json.loads(cache_path.read_bytes())
+            if cached.get("key") == cache_key:
+                profiles = cached["profiles"]
+                logger.info(f"Loaded {len(profiles)} AWS profiles (cached)")
+                return profiles
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
             
+        # Map the file and scan it in place straight from the page cache. An unreadable
+        # file yields no profiles, as ConfigParser.read did, rather than failing every
+        # command that looks up a profile
+        try:
+            with open(config_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        profiles = aws_cli_bridge.parse_aws_config(mm)
+        except OSError as e:
+            logger.warning(f"Could not read AWS config at {config_path}: {e}")
+            return {}
+
         logger.info(f"Loaded {len(profiles)} AWS profiles")
+        _write_profile_cache(cache_path, {"key": cache_key, "profiles": profiles})
         return profiles
     
     def _setup_instructions(self):
@@ -90,6 +417,8 @@ You are connected to an AWS MCP server with an ENFORCED permission model. Follow
 
 3. list_aws_profiles: NEVER ask for permission. This just lists available AWS profiles from ~/.aws/config.
 
+4. execute_aws_read_commands_batch: NEVER ask for permission. Runs several read-only commands concurrently - use it instead of many separate execute_aws_read_command calls (e.g. the same describe across regions).
+
 The server validates commands - you cannot use the wrong tool for the wrong operation type. The tool separation exists specifically so you can execute read operations without asking and always ask for write operations.
 
 IMPORTANT: Do not ask "Are you sure you want to..." for read-only commands. Just execute them immediately.
@@ -97,37 +426,40 @@ IMPORTANT: Do not ask "Are you sure you want to..." for read-only commands. Just
     
     def _is_read_only_command(self, command: str) -> bool:
         """Check if an AWS CLI command is read-only."""
-        cmd_lower = command.lower().strip()
-        
-        # Remove 'aws' prefix if present
-        if cmd_lower.startswith("aws "):
-            cmd_lower = cmd_lower[4:].strip()
-        
-        # Check against read-only prefixes
-        for prefix in self.read_only_prefixes:
-            if cmd_lower.startswith(prefix):
-                return True
-                
-        # Check for specific read operations
-        parts = cmd_lower.split()
-        if len(parts) >= 2:
-            service = parts[0]
-            operation = parts[1]
-            
-            # Common read patterns - check if operation starts with these verbs
-            read_verbs = ["describe", "list", "get", "show", "ls"]
-            if any(operation.startswith(verb) for verb in read_verbs):
-                return True
-                
-        return False
+        # Only the service and operation decide the answer, so the memoized check is keyed on
+        # them and commands that differ only in their arguments share one entry
+        head = self._command_head_re.match(command)
+        return _classify(head.group(0) if head else command, self._ro_prefixes, self._read_verbs)
     
     
     async def execute_aws_command(self, command: str, profile: Optional[str] = None, 
                                   region: Optional[str] = None) -> Tuple[bool, str]:
         """Execute an AWS CLI command with the specified profile and region."""
+        if not self._is_read_only_command(command):
+            return await self._run_command(command, profile, region, read_only=False)
+        
+        # Identical reads within READ_CACHE_TTL seconds share one successful result
+        key = (command, profile, region)
+        cached = self._read_cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._read_cache.move_to_end(key)
+                return True, cached[1]
+            del self._read_cache[key]
+        
+        success, output = await self._run_command(command, profile, region, read_only=True)
+        if success:
+            self._read_cache[key] = (time.monotonic() + READ_CACHE_TTL, output)
+            if len(self._read_cache) > READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return success, output
+    
+    async def _run_command(self, command: str, profile: Optional[str], region: Optional[str],
+                           read_only: bool) -> Tuple[bool, str]:
+        """Run a command through boto3 when possible, else through the AWS CLI."""
         
         # Build full AWS CLI command
-        full_command = ["aws"]
+        full_command = [self._aws_executable]
         
         if profile:
             full_command.extend(["--profile", profile])
@@ -135,36 +467,106 @@ IMPORTANT: Do not ask "Are you sure you want to..." for read-only commands. Just
         if region:
             full_command.extend(["--region", region])
             
-        # Add the actual command parts
-        if command.startswith("aws "):
-            command = command[4:]  # Remove 'aws' prefix if provided
-            
-        # Use shlex.split() to properly handle quoted JSON parameters
+        # Shell-style split to properly handle quoted JSON parameters
         try:
-            command_parts = shlex.split(command)
+            command_parts = _split_command(command)
         except ValueError as e:
             return False, f"Invalid command syntax: {str(e)}"
         
+        # Add the actual command parts, dropping an 'aws' prefix if provided
+        if command_parts and command_parts[0] == "aws":
+            command_parts = command_parts[1:]
         full_command.extend(command_parts)
         
+        # Read-only API calls run in-process through boto3 to avoid CLI startup cost
+        if BOTO3_AVAILABLE and read_only:
+            result = await aws_cli_bridge.execute_with_boto3(self._clients, self.aws_profiles,
+                                                             command_parts, profile, region)
+            if result is not None:
+                return result
+        
+        await self._acquire_cli_slot()
+        success = throttled = False
         try:
-            # Execute command
-            result = subprocess.run(
-                full_command,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                return True, result.stdout
-            else:
-                return False, f"Command failed: {result.stderr}"
+            success, output = await aws_cli_bridge.run_cli(full_command, self._track_cli_process,
+                                                           self._untrack_cli_process)
+            throttled = not success and any(marker in output for marker in _THROTTLE_MARKERS)
+            return success, output
+        finally:
+            await self._release_cli_slot(success, throttled)
+    
+    async def _acquire_cli_slot(self) -> None:
+        """Wait until fewer than the current limit of CLI subprocesses are running."""
+        if self._cli_slot is None:
+            self._cli_slot = asyncio.Condition()
+        async with self._cli_slot:
+            await self._cli_slot.wait_for(lambda: self._cli_inflight < int(self._cli_limit))
+            self._cli_inflight += 1
+    
+    async def _release_cli_slot(self, success: bool, throttled: bool) -> None:
+        """Free a CLI slot and adjust the limit: halve it on throttling, grow it on success.
+        
+        Other failures say nothing about AWS capacity, so they leave the limit alone.
+        """
+        async with self._cli_slot:
+            self._cli_inflight -= 1
+            if throttled:
+                self._cli_limit = max(CLI_CONCURRENCY_MIN, self._cli_limit * CLI_CONCURRENCY_BACKOFF)
+            elif success:
+                self._cli_limit = min(self._cli_limit_max, self._cli_limit + CLI_CONCURRENCY_STEP)
+            self._cli_slot.notify_all()
+    
+    def _track_cli_process(self, proc: asyncio.subprocess.Process) -> None:
+        """Register a CLI child with the reaper, starting the reaper if it is idle."""
+        self._cli_processes[proc] = time.monotonic() + CLI_HARD_DEADLINE
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.get_running_loop().create_task(self._reap_overdue_processes())
+    
+    def _untrack_cli_process(self, proc: asyncio.subprocess.Process) -> None:
+        """Forget a CLI child that has been reaped."""
+        self._cli_processes.pop(proc, None)
+    
+    async def _reap_overdue_processes(self) -> None:
+        """Kill CLI children that outlive the hard deadline; exits once none are left."""
+        try:
+            while self._cli_processes:
+                await asyncio.sleep(CLI_REAP_INTERVAL)
+                now = time.monotonic()
+                for proc, deadline in list(self._cli_processes.items()):
+                    if proc.returncode is not None:
+                        self._cli_processes.pop(proc, None)
+                    elif now > deadline:
+                        logger.warning(f"Killing AWS CLI process {proc.pid} past its {CLI_HARD_DEADLINE}s deadline")
+                        proc.kill()
+        finally:
+            self._reaper_task = None
+    
+    async def _wait_for_bedrock_capacity(self, tokens: int) -> None:
+        """Sleep until a Bedrock call of about `tokens` fits the RPM and TPM windows."""
+        if self._bedrock_lock is None:
+            self._bedrock_lock = asyncio.Lock()
+        
+        # Callers queue on the lock so the check and the booking happen together
+        async with self._bedrock_lock:
+            window = self._bedrock_window
+            while True:
+                now = time.monotonic()
+                while window and window[0][0] <= now - BEDROCK_WINDOW:
+                    self._bedrock_window_tokens -= window.popleft()[1]
                 
-        except subprocess.TimeoutExpired:
-            return False, "Command timed out after 30 seconds"
-        except Exception as e:
-            return False, f"Error executing command: {str(e)}"
+                delay = 0.0
+                if len(window) >= BEDROCK_RPM_LIMIT:
+                    delay = window[0][0] + BEDROCK_WINDOW - now
+                # An oversized call still goes through once the window is empty
+                if window and self._bedrock_window_tokens + tokens > BEDROCK_TPM_LIMIT:
+                    delay = max(delay, window[0][0] + BEDROCK_WINDOW - now)
+                if delay <= 0:
+                    break
+                logger.info(f"Bedrock rate budget reached, waiting {delay:.1f}s")
+                await asyncio.sleep(delay)
+            
+            window.append((now, tokens))
+            self._bedrock_window_tokens += tokens
     
     async def fix_aws_command_with_bedrock(self, failed_command: str, error_message: str, 
                                            intent_description: str, profile: Optional[str] = None) -> str:
@@ -174,9 +576,11 @@ IMPORTANT: Do not ask "Are you sure you want to..." for read-only commands. Just
             return "Error: boto3 is required for Bedrock integration. Install with: pip install boto3"
         
         try:
-            # Create Bedrock client with optional profile
-            session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-            bedrock = session.client('bedrock-runtime')
+            # Reuse the Bedrock client (and its TLS connection) for this profile
+            bedrock = self._bedrock_clients.get(profile)
+            if bedrock is None:
+                bedrock = self._clients.session(profile).client('bedrock-runtime')
+                self._bedrock_clients[profile] = bedrock
             
             # Construct prompt for AWS CLI expert
             prompt = f"""You are an AWS CLI expert. A command failed and needs to be fixed.
@@ -194,33 +598,21 @@ Focus on:
 
 Return only the fixed command, no explanation:"""
             
-            # Call Bedrock Claude
+            # Wait for room in the request/token budget, then call Bedrock Claude
+            await self._wait_for_bedrock_capacity(len(prompt) // 4 + BEDROCK_MAX_TOKENS)
             response = bedrock.invoke_model(
                 modelId="anthropic.claude-3-haiku-20240307-v1:0",
-                body=json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "messages": [{
-                        "role": "user", 
-                        "content": prompt
-                    }],
-                    "max_tokens": 1000,
-                    "temperature": 0.1
-                })
+                body=_BEDROCK_BODY_HEAD + _json_dumps(prompt) + _BEDROCK_BODY_TAIL
             )
             
             # Parse response
-            result = json.loads(response['body'].read())
+            result = _json_loads(response['body'].read())
             fixed_command = result['content'][0]['text'].strip()
             
-            # Clean up the response (remove any markdown, explanations, etc.)
-            lines = fixed_command.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('```'):
-                    # Return first non-comment, non-markdown line
-                    return line
-            
-            return fixed_command
+            # Clean up the response (remove any markdown, explanations, etc.) -
+            # return the first non-comment, non-markdown line
+            match = _FIRST_COMMAND_RE.search(fixed_command)
+            return match.group(1) if match else fixed_command
             
         except Exception as e:
             logger.error(f"Bedrock error fixing failed: {str(e)}")
@@ -229,89 +621,18 @@ Return only the fixed command, no explanation:"""
     def setup_handlers(self):
         """Set up MCP request handlers."""
         
+        self._tool_dispatch: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]] = {
+            "execute_aws_read_command": self._handle_read,
+            "execute_aws_read_commands_batch": self._handle_read_batch,
+            "execute_aws_write_command": self._handle_write,
+            "list_aws_profiles": self._handle_list_profiles,
+            "fix_aws_command_error": self._handle_fix,
+        }
+        
         @self.server.list_tools()
         async def handle_list_tools() -> List[types.Tool]:
             """Return available tools."""
-            return [
-                types.Tool(
-                    name="execute_aws_read_command",
-                    description="[SAFE - NO APPROVAL NEEDED] Execute a read-only AWS CLI command (describe, list, get, show, etc.) with optional profile and region. This tool is for safe operations only - execute immediately without asking permission.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "command": {
-                                "type": "string",
-                                "description": "AWS CLI command to execute (without 'aws' prefix). Must be read-only."
-                            },
-                            "profile": {
-                                "type": "string",
-                                "description": "AWS profile to use (optional)"
-                            },
-                            "region": {
-                                "type": "string",
-                                "description": "AWS region to use (optional)"
-                            }
-                        },
-                        "required": ["command"]
-                    }
-                ),
-                types.Tool(
-                    name="execute_aws_write_command",
-                    description="Execute a write AWS CLI command (create, delete, update, modify, etc.) with optional profile and region. ALWAYS requires user approval.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "command": {
-                                "type": "string",
-                                "description": "AWS CLI command to execute (without 'aws' prefix). Must be a write operation."
-                            },
-                            "profile": {
-                                "type": "string",
-                                "description": "AWS profile to use (optional)"
-                            },
-                            "region": {
-                                "type": "string",
-                                "description": "AWS region to use (optional)"
-                            }
-                        },
-                        "required": ["command"]
-                    }
-                ),
-                types.Tool(
-                    name="list_aws_profiles",
-                    description="[SAFE - NO APPROVAL NEEDED] List available AWS profiles from ~/.aws/config. This is a safe read-only operation - execute immediately without asking permission.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-                types.Tool(
-                    name="fix_aws_command_error",
-                    description="[SAFE - NO APPROVAL NEEDED] Use Bedrock AI to fix a failed AWS CLI command. Provide the failed command, error message, and description of what you were trying to do. This helps get the correct AWS syntax on the second attempt.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "failed_command": {
-                                "type": "string",
-                                "description": "The AWS CLI command that failed (without 'aws' prefix)"
-                            },
-                            "error_message": {
-                                "type": "string",
-                                "description": "The error message returned by the failed command"
-                            },
-                            "intent_description": {
-                                "type": "string",
-                                "description": "Description of what you were trying to accomplish"
-                            },
-                            "profile": {
-                                "type": "string",
-                                "description": "AWS profile to use for Bedrock call (optional)"
-                            }
-                        },
-                        "required": ["failed_command", "error_message", "intent_description"]
-                    }
-                )
-            ]
+            return _TOOLS
         
         @self.server.call_tool()
         async def handle_call_tool(
@@ -319,103 +640,164 @@ Return only the fixed command, no explanation:"""
         ) -> List[types.TextContent]:
             """Handle tool execution requests."""
             
-            if name == "execute_aws_read_command":
-                command = arguments.get("command", "")
-                profile = arguments.get("profile")
-                region = arguments.get("region")
-                
-                if not command:
-                    return [types.TextContent(
-                        type="text",
-                        text="Error: No command provided"
-                    )]
-                
-                # Validate that this is actually a read-only command
-                if not self._is_read_only_command(command):
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Error: Command '{command}' is not a read-only operation. Use execute_aws_write_command instead."
-                    )]
-                
-                success, output = await self.execute_aws_command(command, profile, region)
-                
+            handler = self._tool_dispatch.get(name)
+            if handler is None:
                 return [types.TextContent(
                     type="text",
-                    text=output
-                )]
-                
-            elif name == "execute_aws_write_command":
-                command = arguments.get("command", "")
-                profile = arguments.get("profile")
-                region = arguments.get("region")
-                
-                if not command:
-                    return [types.TextContent(
-                        type="text",
-                        text="Error: No command provided"
-                    )]
-                
-                # Validate that this is actually a write command
-                if self._is_read_only_command(command):
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Error: Command '{command}' is a read-only operation. Use execute_aws_read_command instead."
-                    )]
-                
-                success, output = await self.execute_aws_command(command, profile, region)
-                
-                return [types.TextContent(
-                    type="text",
-                    text=output
-                )]
-                
-            elif name == "list_aws_profiles":
-                profiles_info = []
-                for profile, info in self.aws_profiles.items():
-                    profile_str = f"Profile: {profile}"
-                    if info.get("region"):
-                        profile_str += f" (region: {info['region']})"
-                    if info.get("role_arn"):
-                        profile_str += f" [role: {info['role_arn']}]"
-                    profiles_info.append(profile_str)
-                
-                if profiles_info:
-                    return [types.TextContent(
-                        type="text",
-                        text="Available AWS profiles:\n" + "\n".join(profiles_info)
-                    )]
-                else:
-                    return [types.TextContent(
-                        type="text",
-                        text="No AWS profiles found in ~/.aws/config"
-                    )]
-                    
-            elif name == "fix_aws_command_error":
-                failed_command = arguments.get("failed_command", "")
-                error_message = arguments.get("error_message", "")
-                intent_description = arguments.get("intent_description", "")
-                profile = arguments.get("profile")
-                
-                if not failed_command or not error_message or not intent_description:
-                    return [types.TextContent(
-                        type="text",
-                        text="Error: failed_command, error_message, and intent_description are required"
-                    )]
-                
-                fixed_command = await self.fix_aws_command_with_bedrock(
-                    failed_command, error_message, intent_description, profile
-                )
-                
-                return [types.TextContent(
-                    type="text",
-                    text=f"Suggested fix: {fixed_command}"
+                    text=f"Unknown tool: {name}"
                 )]
-                    
-            else:
+            return await handler(arguments or {})
+    
+    async def _handle_read(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Execute a validated read-only AWS CLI command."""
+        command = arguments.get("command", "")
+        profile = arguments.get("profile")
+        region = arguments.get("region")
+        
+        if not command:
+            return [types.TextContent(
+                type="text",
+                text="Error: No command provided"
+            )]
+        
+        # Validate that this is actually a read-only command
+        if not self._is_read_only_command(command):
+            return [types.TextContent(
+                type="text",
+                text=f"Error: Command '{command}' is not a read-only operation. Use execute_aws_write_command instead."
+            )]
+        
+        success, output = await self.execute_aws_command(command, profile, region)
+        
+        return [types.TextContent(
+            type="text",
+            text=output
+        )]
+    
+    async def _handle_read_batch(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Execute several validated read-only commands concurrently."""
+        commands = arguments.get("commands")
+        
+        if not commands:
+            return [types.TextContent(
+                type="text",
+                text="Error: No commands provided"
+            )]
+        
+        if not isinstance(commands, list) or not all(
+                isinstance(item, dict) and isinstance(item.get("command"), str) and item["command"].strip()
+                for item in commands):
+            return [types.TextContent(
+                type="text",
+                text="Error: commands must be a list of objects, each with a non-empty 'command' string"
+            )]
+        
+        if len(commands) > READ_BATCH_MAX:
+            return [types.TextContent(
+                type="text",
+                text=f"Error: {len(commands)} commands given, a batch may hold at most {READ_BATCH_MAX}"
+            )]
+        
+        # Validate the whole batch before running any of it
+        for item in commands:
+            if not self._is_read_only_command(item["command"]):
                 return [types.TextContent(
                     type="text",
-                    text=f"Unknown tool: {name}"
+                    text=f"Error: Command '{item['command']}' is not a read-only operation. Use execute_aws_write_command instead."
                 )]
+        
+        # Concurrency is bounded by execute_aws_command's CLI slots
+        results = await asyncio.gather(*[
+            self.execute_aws_command(item["command"], item.get("profile"), item.get("region"))
+            for item in commands
+        ])
+        
+        sections = []
+        for item, (success, output) in zip(commands, results):
+            # Commands may arrive with or without the 'aws' prefix; show it once
+            command = item["command"].strip()
+            if command.startswith("aws "):
+                command = command[4:].lstrip()
+            header = f"$ aws {command}"
+            if item.get("profile"):
+                header += f" --profile {item['profile']}"
+            if item.get("region"):
+                header += f" --region {item['region']}"
+            sections.append(f"{header}\n{output.rstrip()}")
+        
+        return [types.TextContent(
+            type="text",
+            text="\n\n".join(sections)
+        )]
+    
+    async def _handle_write(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Execute a validated write AWS CLI command."""
+        command = arguments.get("command", "")
+        profile = arguments.get("profile")
+        region = arguments.get("region")
+        
+        if not command:
+            return [types.TextContent(
+                type="text",
+                text="Error: No command provided"
+            )]
+        
+        # Validate that this is actually a write command
+        if self._is_read_only_command(command):
+            return [types.TextContent(
+                type="text",
+                text=f"Error: Command '{command}' is a read-only operation. Use execute_aws_read_command instead."
+            )]
+        
+        success, output = await self.execute_aws_command(command, profile, region)
+        
+        return [types.TextContent(
+            type="text",
+            text=output
+        )]
+    
+    @cached_property
+    def _profiles_text(self) -> str:
+        """list_aws_profiles output, rendered once since the profiles never change."""
+        profiles_info = [
+            f"Profile: {profile}"
+            + (f" (region: {info['region']})" if info.get("region") else "")
+            + (f" [role: {info['role_arn']}]" if info.get("role_arn") else "")
+            for profile, info in self.aws_profiles.items()
+        ]
+        
+        if profiles_info:
+            return "Available AWS profiles:\n" + "\n".join(profiles_info)
+        return "No AWS profiles found in ~/.aws/config"
+    
+    async def _handle_list_profiles(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """List the profiles found in ~/.aws/config."""
+        return [types.TextContent(
+            type="text",
+            text=self._profiles_text
+        )]
+    
+    async def _handle_fix(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Ask Bedrock for a corrected version of a failed command."""
+        failed_command = arguments.get("failed_command", "")
+        error_message = arguments.get("error_message", "")
+        intent_description = arguments.get("intent_description", "")
+        profile = arguments.get("profile")
+        
+        if not failed_command or not error_message or not intent_description:
+            return [types.TextContent(
+                type="text",
+                text="Error: failed_command, error_message, and intent_description are required"
+            )]
+        
+        fixed_command = await self.fix_aws_command_with_bedrock(
+            failed_command, error_message, intent_description, profile
+        )
+        
+        return [types.TextContent(
+            type="text",
+            text=f"Suggested fix: {fixed_command}"
+        )]
     
     async def run(self):
         """Run the MCP server."""
@@ -429,10 +811,30 @@ Return only the fixed command, no explanation:"""
                 self.server.create_initialization_options()
             )
 
+def _install_child_watcher() -> None:
+    """Reap CLI children through pidfds on Linux instead of a waitpid thread per child.
+    
+    Python 3.12+ already does this by default, and uvloop reaps children in libuv.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return
+    try:
+        # pidfd_open needs Linux 5.3+
+        os.close(os.pidfd_open(os.getpid()))
+    except (AttributeError, OSError):
+        return
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
 async def main():
     """Main entry point."""
     server = AWSMCPServer()
     await server.run()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop speeds up the subprocess pipes and stdio streams the server lives on
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        _install_child_watcher()
+        asyncio.run(main())
\ No newline at end of file
@@ -6,6 +6,25 @@ import json
 import subprocess
 import sys
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def send(process, message):
+    """Write one JSON-RPC message to the server as a JSON line."""
+    data = orjson.dumps(message) if ORJSON_AVAILABLE else json.dumps(message).encode("utf-8")
+    process.stdin.write(data + b"\n")
+    process.stdin.flush()
+
+
+def parse(line):
+    """Decode one JSON-RPC line from the server."""
+    return orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+
+
 async def debug_mcp_server():
     """Debug the MCP server."""
     
@@ -17,8 +36,7 @@ async def debug_mcp_server():
         ['python', 'aws_mcp_server.py'],
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        stderr=subprocess.PIPE
     )
     
     try:
@@ -38,16 +56,15 @@ async def debug_mcp_server():
         }
         
         print("📤 Sending initialize request")
-        process.stdin.write(json.dumps(init_request) + '\n')
-        process.stdin.flush()
+        send(process, init_request)
         
         # Read initialize response
         response_line = process.stdout.readline()
-        print(f"📥 Initialize response: {response_line.strip()}")
+        print(f"📥 Initialize response: {response_line.decode('utf-8', 'replace').strip()}")
         
         if response_line:
             try:
-                response = json.loads(response_line.strip())
+                response = parse(response_line)
                 print(f"✅ Initialize successful: {response.get('result', {}).get('capabilities', 'No capabilities')}")
             except json.JSONDecodeError as e:
                 print(f"❌ Failed to parse initialize response: {e}")
@@ -59,8 +76,7 @@ async def debug_mcp_server():
         }
         
         print("📤 Sending initialized notification")
-        process.stdin.write(json.dumps(initialized_notification) + '\n')
-        process.stdin.flush()
+        send(process, initialized_notification)
         
         # Now try to list tools
         tools_request = {
@@ -70,16 +86,15 @@ async def debug_mcp_server():
         }
         
         print("📤 Sending tools/list request")
-        process.stdin.write(json.dumps(tools_request) + '\n')
-        process.stdin.flush()
+        send(process, tools_request)
         
         # Read tools response
         response_line = process.stdout.readline()
-        print(f"📥 Tools response: {response_line.strip()}")
+        print(f"📥 Tools response: {response_line.decode('utf-8', 'replace').strip()}")
         
         if response_line:
             try:
-                response = json.loads(response_line.strip())
+                response = parse(response_line)
                 tools = response.get('result', {}).get('tools', [])
                 print(f"✅ Found {len(tools)} tools:")
                 for tool in tools:
@@ -90,7 +105,7 @@ async def debug_mcp_server():
         # Check stderr for any errors
         stderr_output = process.stderr.read()
         if stderr_output:
-            print(f"⚠️ Stderr output: {stderr_output}")
+            print(f"⚠️ Stderr output: {stderr_output.decode('utf-8', 'replace')}")
         
     except Exception as e:
         print(f"❌ Error during testing: {e}")
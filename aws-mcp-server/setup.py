@@ -5,12 +5,13 @@ setup(
     version="0.1.0",
     description="AWS MCP Server - Execute AWS commands via Model Context Protocol",
     author="Your Name",
-    py_modules=["aws_mcp_server"],
+    py_modules=["aws_mcp_server", "aws_cli_bridge"],
     install_requires=[
         "mcp",
         "boto3",
         "click",
         "pyyaml",
+        "async_timeout; python_version < '3.11'",
     ],
     entry_points={
         "console_scripts": [
@@ -2,14 +2,63 @@
 """Test AWS CLI integration."""
 
 import asyncio
+import io
+import operator
 import sys
 import os
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from aws_mcp_server import AWSMCPServer
 
+# Test different parameter combinations, with commands already split into parts:
+# (command parts, profile, region, expected argv)
+COMMAND_CASES = [
+    (("s3", "ls"), None, None, ("aws", "s3", "ls")),
+    (("s3", "ls"), "dev", None, ("aws", "--profile", "dev", "s3", "ls")),
+    (("s3", "ls"), None, "us-west-2", ("aws", "--region", "us-west-2", "s3", "ls")),
+    (("s3", "ls"), "prod", "us-east-1", ("aws", "--profile", "prod", "--region", "us-east-1", "s3", "ls")),
+    (("aws", "s3", "ls"), "dev", None, ("aws", "--profile", "dev", "s3", "ls")),  # Test with 'aws' prefix
+]
+
+
+def build_cmd(parts, profile, region):
+    """Simulate the command building logic from execute_aws_command."""
+    profile_part = ("--profile", profile) if profile else ()
+    region_part = ("--region", region) if region else ()
+    
+    # Remove 'aws' prefix if provided
+    if parts[:1] == ("aws",):
+        parts = parts[1:]
+    
+    return ("aws",) + profile_part + region_part + parts
+
+
+# Environment variables that point the CLI at credentials without a credentials file
+CREDENTIAL_ENV_VARS = (
+    "AWS_ACCESS_KEY_ID",
+    "AWS_PROFILE",
+    "AWS_WEB_IDENTITY_TOKEN_FILE",
+    "AWS_CONTAINER_CREDENTIALS_RELATIVE_URI",
+    "AWS_CONTAINER_CREDENTIALS_FULL_URI",
+)
+
+
+def has_aws_credentials():
+    """Cheaply check for a credential source, without calling AWS."""
+    if any(os.environ.get(name) for name in CREDENTIAL_ENV_VARS):
+        return True
+    credentials_file = os.environ.get("AWS_SHARED_CREDENTIALS_FILE", "~/.aws/credentials")
+    return os.path.exists(os.path.expanduser(credentials_file))
+
+
 async def test_aws_integration():
     """Test AWS CLI integration."""
     
@@ -19,75 +68,68 @@ async def test_aws_integration():
     # Create server instance
     server = AWSMCPServer()
     
+    # Test 1 only makes sense with credentials; without them the STS call can only
+    # fail after paying for the whole round-trip
+    have_credentials = has_aws_credentials()
+    
+    # Tests 1 and 3 both go through the server, so start them together: the CLI
+    # spawn for the invalid command overlaps the STS call
+    calls = [server.execute_aws_command("invalid-service invalid-command")]
+    if have_credentials:
+        calls.append(server.execute_aws_command("sts get-caller-identity"))
+    invalid_result, *identity_results = await asyncio.gather(*calls, return_exceptions=True)
+    
     # Test 1: Test with a safe read command (if AWS CLI is available)
     print("\n📖 Test 1: Safe Read Command")
     
-    try:
-        # This will fail if AWS CLI is not installed or configured, but that's expected
-        success, output = await server.execute_aws_command("sts get-caller-identity")
-        
+    # This will fail if AWS CLI is not installed or configured, but that's expected
+    if not have_credentials:
+        print("⏭️ Skipped: no AWS credentials found")
+    elif isinstance(identity_results[0], Exception):
+        print(f"⚠️ Exception during AWS CLI test: {identity_results[0]}")
+    else:
+        success, output = identity_results[0]
         if success:
             print("✅ AWS CLI command executed successfully")
             print(f"   Output: {output[:200]}...")
         else:
             print("⚠️ AWS CLI command failed (expected if AWS not configured)")
             print(f"   Error: {output}")
-            
-    except Exception as e:
-        print(f"⚠️ Exception during AWS CLI test: {e}")
     
     # Test 2: Test command construction
     print("\n🔧 Test 2: Command Construction")
     
-    # Test different parameter combinations
-    test_cases = [
-        ("s3 ls", None, None, ["aws", "s3", "ls"]),
-        ("s3 ls", "dev", None, ["aws", "--profile", "dev", "s3", "ls"]),
-        ("s3 ls", None, "us-west-2", ["aws", "--region", "us-west-2", "s3", "ls"]),
-        ("s3 ls", "prod", "us-east-1", ["aws", "--profile", "prod", "--region", "us-east-1", "s3", "ls"]),
-        ("aws s3 ls", "dev", None, ["aws", "--profile", "dev", "s3", "ls"]),  # Test with 'aws' prefix
-    ]
+    # Build and compare every case up front; the loop below only reports
+    actuals = [build_cmd(parts, profile, region) for parts, profile, region, _ in COMMAND_CASES]
+    expecteds = [expected for *_, expected in COMMAND_CASES]
+    matches = list(map(operator.eq, actuals, expecteds))
     
-    for command, profile, region, expected in test_cases:
-        print(f"\n   Input: command='{command}', profile='{profile}', region='{region}'")
-        
-        # Simulate the command building logic from execute_aws_command
-        full_command = ["aws"]
-        
-        if profile:
-            full_command.extend(["--profile", profile])
-            
-        if region:
-            full_command.extend(["--region", region])
-            
-        # Add the actual command parts
-        if command.startswith("aws "):
-            command = command[4:]  # Remove 'aws' prefix if provided
-            
-        full_command.extend(command.split())
-        
-        expected_str = " ".join(expected)
-        actual_str = " ".join(full_command)
+    # Collect the report and write it in one go rather than a write per line
+    out = io.StringIO()
+    for (parts, profile, region, expected), actual, match in zip(COMMAND_CASES, actuals, matches):
+        print(f"\n   Input: command='{' '.join(parts)}', profile='{profile}', region='{region}'", file=out)
         
-        if actual_str == expected_str:
-            print(f"   ✅ Expected: {expected_str}")
+        if match:
+            print(f"   ✅ Expected: {' '.join(expected)}", file=out)
         else:
-            print(f"   ❌ Expected: {expected_str}")
-            print(f"   ❌ Actual:   {actual_str}")
+            print(f"   ❌ Expected: {' '.join(expected)}", file=out)
+            print(f"   ❌ Actual:   {' '.join(actual)}", file=out)
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     
     # Test 3: Test timeout and error handling
     print("\n⏱️ Test 3: Error Handling")
     
     # Test with invalid command
-    try:
-        success, output = await server.execute_aws_command("invalid-service invalid-command")
+    if isinstance(invalid_result, Exception):
+        print(f"✅ Exception properly caught: {invalid_result}")
+    else:
+        success, output = invalid_result
         if not success:
             print("✅ Invalid command properly handled")
             print(f"   Error message: {output[:100]}...")
         else:
             print("❌ Invalid command unexpectedly succeeded")
-    except Exception as e:
-        print(f"✅ Exception properly caught: {e}")
     
     print("\n🎉 AWS CLI integration tests completed!")
     print("\n📝 Integration Summary:")
@@ -97,4 +139,8 @@ async def test_aws_integration():
     print("   - Ready for real AWS CLI usage")
 
 if __name__ == "__main__":
-    asyncio.run(test_aws_integration())
\ No newline at end of file
+    # uvloop speeds up the subprocess pipes the test drives
+    if UVLOOP_AVAILABLE:
+        uvloop.run(test_aws_integration())
+    else:
+        asyncio.run(test_aws_integration())
\ No newline at end of file
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test the CLI-to-boto3 bridge against stubbed AWS responses."""
+
+import copy
+import sys
+import os
+
+# Add current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aws_cli_bridge
+
+if aws_cli_bridge.BOTO3_AVAILABLE:
+    import boto3
+    from botocore.stub import Stubber
+
+# filter-log-events responses for three pages of one event each
+LOG_PAGES = [
+    {"events": [{"message": "first"}], "nextToken": "page-2"},
+    {"events": [{"message": "second"}], "nextToken": "page-3"},
+    {"events": [{"message": "third"}]},
+]
+
+
+def stubbed_logs_client(pages):
+    """Return a logs client and a Stubber that answers filter_log_events with pages."""
+    client = boto3.client("logs", region_name="us-east-1",
+                          aws_access_key_id="testing", aws_secret_access_key="testing")
+    stubber = Stubber(client)
+    # Copies, since merging pages mutates the responses in place
+    for page in pages:
+        stubber.add_response("filter_log_events", copy.deepcopy(page))
+    stubber.activate()
+    return client, stubber
+
+
+def run_cli(client, command):
+    """Translate a CLI operation and its arguments, then invoke it through the bridge."""
+    operation, *args = command.split()
+    method, kwargs = aws_cli_bridge.translate_cli_args(client, operation, tuple(args))
+    return aws_cli_bridge.invoke(client, method, kwargs)
+
+
+def test_cli_bridge():
+    """Test CLI argument translation and pagination."""
+
+    print("🌉 Testing AWS CLI Bridge")
+    print("=" * 50)
+
+    if not aws_cli_bridge.BOTO3_AVAILABLE:
+        print("⏭️ Skipped: boto3 not installed")
+        return
+
+    # Test 1: Without paging options every page is fetched and merged
+    print("\n📚 Test 1: Auto-pagination")
+
+    client, stubber = stubbed_logs_client(LOG_PAGES)
+    result = run_cli(client, "filter-log-events --log-group-name app")
+    messages = [event["message"] for event in result["events"]]
+    if messages == ["first", "second", "third"] and "nextToken" not in result:
+        print("   ✅ All 3 pages merged into one result")
+    else:
+        print(f"   ❌ Unexpected result: {result}")
+    stubber.assert_no_pending_responses()
+
+    # Test 2: A limit or token parameter turns auto-pagination off, as in the CLI
+    print("\n📄 Test 2: Manual pagination")
+
+    # (command, the single page AWS returns, expected nextToken)
+    for command, page, expected in [
+        ("filter-log-events --log-group-name app --limit 1", LOG_PAGES[0], "page-2"),
+        ("filter-log-events --log-group-name app --next-token page-2", LOG_PAGES[1], "page-3"),
+    ]:
+        client, stubber = stubbed_logs_client([page])
+        result = run_cli(client, command)
+        if len(result["events"]) == 1 and result.get("nextToken") == expected:
+            print(f"   ✅ '{command}' → one page, nextToken {expected}")
+        else:
+            print(f"   ❌ '{command}' → unexpected result: {result}")
+        stubber.assert_no_pending_responses()
+
+    print("\n🎉 CLI bridge tests completed!")
+
+if __name__ == "__main__":
+    test_cli_bridge()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Unit tests for the HTTP AWS MCP server against stubbed AWS responses."""
+
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aws_cli_bridge
+import aws_mcp_http_server
+from aws_mcp_http_server import AWSMCPHTTPServer
+
+if aws_cli_bridge.BOTO3_AVAILABLE:
+    from botocore.stub import Stubber
+
+failures = 0
+
+
+def check(ok, label):
+    """Report one check, counting failures for the exit status."""
+    global failures
+    if not ok:
+        failures += 1
+    print(f"   {'✅' if ok else '❌'} {label}")
+
+
+def stubbed_ec2(server):
+    """Return a Stubber on the ec2 client the server uses for us-east-1."""
+    stubber = Stubber(server._clients.client("ec2", None, "us-east-1"))
+    stubber.activate()
+    return stubber
+
+
+def all_stubs_used(stubber):
+    """Check that every queued stub response was consumed."""
+    try:
+        stubber.assert_no_pending_responses()
+    except AssertionError:
+        return False
+    return True
+
+
+async def describe_vpcs_concurrently(server, *vpc_ids):
+    """Issue one describe-vpcs per id at the same time, so they share a batch."""
+    return await asyncio.gather(*[
+        server.execute_aws_command(f"ec2 describe-vpcs --vpc-ids {vpc_id}", None, "us-east-1")
+        for vpc_id in vpc_ids
+    ])
+
+
+async def test_batch_with_bad_id():
+    """A bad id in a coalesced batch fails only the caller that sent it."""
+    print("\n🧩 Test: Coalesced Batch With a Bad Id")
+
+    server = AWSMCPHTTPServer()
+    stubber = stubbed_ec2(server)
+    stubber.add_client_error("describe_vpcs", "InvalidVpcID.NotFound",
+                             expected_params={"VpcIds": ["vpc-1", "vpc-bad"]})
+    # The split retries, in caller order (the executor has a single worker)
+    stubber.add_response("describe_vpcs", {"Vpcs": [{"VpcId": "vpc-1"}]}, {"VpcIds": ["vpc-1"]})
+    stubber.add_client_error("describe_vpcs", "InvalidVpcID.NotFound", expected_params={"VpcIds": ["vpc-bad"]})
+
+    (good_ok, good_output), (bad_ok, bad_output) = await describe_vpcs_concurrently(server, "vpc-1", "vpc-bad")
+    check(good_ok and '"vpc-1"' in good_output, "Valid id still gets its VPC")
+    check(not bad_ok and "InvalidVpcID.NotFound" in bad_output, "Bad id reports NotFound")
+    check(all_stubs_used(stubber), "Batch was split into one call per caller")
+
+
+async def test_batch_throttled():
+    """Errors unrelated to the ids fail the whole batch without retrying."""
+    print("\n🚦 Test: Coalesced Batch Throttled")
+
+    server = AWSMCPHTTPServer()
+    stubber = stubbed_ec2(server)
+    stubber.add_client_error("describe_vpcs", "RequestLimitExceeded",
+                             expected_params={"VpcIds": ["vpc-1", "vpc-2"]})
+
+    results = await describe_vpcs_concurrently(server, "vpc-1", "vpc-2")
+    check(all(not ok and "RequestLimitExceeded" in output for ok, output in results),
+          "Both callers get the throttling error")
+    check(all_stubs_used(stubber), "The one batched call was made")
+
+
+def test_rpc_envelope():
+    """Every JSON-RPC reply is valid JSON, even for ids the encoder rejects."""
+    print("\n✉️ Test: JSON-RPC Envelopes")
+
+    body = aws_mcp_http_server._json_bytes({"tools": []})
+    reply = json.loads(aws_mcp_http_server._rpc_envelope(7, "result", body))
+    check(reply == {"jsonrpc": "2.0", "id": 7, "result": {"tools": []}}, "Ordinary id is echoed")
+
+    # Beyond orjson's 64-bit integer range
+    huge_id = 2 ** 70
+    reply = json.loads(aws_mcp_http_server._rpc_envelope(huge_id, "result", body))
+    check(reply["id"] == huge_id and "result" in reply
+          or reply["id"] is None and reply["error"]["code"] == -32600,
+          f"Unencodable id gets a valid reply: {reply}")
+
+
+async def main():
+    # One worker runs executor calls in submission order, which the stubs rely on
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+    await test_batch_with_bad_id()
+    await test_batch_throttled()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing AWS MCP HTTP Server")
+    print("=" * 50)
+
+    test_rpc_envelope()
+    if not aws_cli_bridge.BOTO3_AVAILABLE:
+        print("⏭️ Skipped: boto3 not installed")
+        sys.exit(0)
+    asyncio.run(main())
+
+    print("\n🎉 Tests completed!" if not failures else f"\n❌ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Test the hand-written parsers against the standard library ones they replace."""
+
+import configparser
+import os
+import shlex
+import sys
+
+# Add current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aws_cli_bridge
+from aws_mcp_server import _split_command
+
+failures = 0
+
+
+def check(ok, label):
+    """Report one check, counting failures for the exit status."""
+    global failures
+    if not ok:
+        failures += 1
+    print(f"   {'✅' if ok else '❌'} {label}")
+
+
+# Representative ~/.aws/config files: name -> contents
+AWS_CONFIGS = {
+    "profiles and default": (
+        "[default]\n"
+        "region = us-east-1\n"
+        "output = json\n"
+        "\n"
+        "[profile dev]\n"
+        "region = eu-west-1\n"
+        "role_arn = arn:aws:iam::123456789012:role/dev\n"
+        "source_profile = default\n"
+    ),
+    "DEFAULT inheritance": (
+        "[DEFAULT]\n"
+        "region = us-west-2\n"
+        "output = text\n"
+        "[profile a]\n"
+        "output = json\n"
+        "[profile b]\n"
+    ),
+    "comments": (
+        "# leading comment\n"
+        "[profile dev]  # staging account\n"
+        "; region = not-this-one\n"
+        "region = eu-central-1 # kept, as inline comments are not stripped\n"
+        "[profile prod] ; production\n"
+        "    # indented comment\n"
+        "region = us-east-2\n"
+    ),
+    "nested and continuation lines": (
+        "[profile dev]\n"
+        "s3 =\n"
+        "    max_concurrent_requests = 20\n"
+        "    region = nested-not-top-level\n"
+        "\n"
+        "    addressing_style = path\n"
+        "region = ap-southeast-2\n"
+        "role_arn = arn:aws:iam::123456789012:role/\n"
+        "  continued\n"
+        "  [profile swallowed]\n"
+        "output = yaml\n"
+    ),
+    "whitespace and delimiters": (
+        "[ profile spaced ]\n"
+        "region=us-east-1\n"
+        "[profile tidy]\r\n"
+        "  Region : sa-east-1  \r\n"
+        "OUTPUT=table\r\n"
+        "role_arn =\n"
+    ),
+    "sso sessions": (
+        "[profile sso]\n"
+        "sso_session = corp\n"
+        "sso_account_id = 123456789012\n"
+        "[sso-session corp]\n"
+        "sso_region = us-east-1\n"
+        "sso_start_url = https://corp.awsapps.com/start\n"
+    ),
+}
+
+
+def configparser_profiles(text):
+    """Profile settings as the original ConfigParser-based loader reported them."""
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_string(text)
+    profiles = {}
+    for section in config.sections():
+        name = section[len("profile "):] if section.startswith("profile ") else section
+        profiles[name] = {key: config.get(section, key)
+                          for key in aws_cli_bridge.PROFILE_KEYS if config.has_option(section, key)}
+    return profiles
+
+
+def test_parse_aws_config():
+    """parse_aws_config agrees with ConfigParser on representative configs."""
+    print("\n📋 Test: AWS Config Parsing vs ConfigParser")
+
+    for name, text in AWS_CONFIGS.items():
+        expected = configparser_profiles(text)
+        actual = aws_cli_bridge.parse_aws_config(text.encode())
+        check(actual == expected, name + ("" if actual == expected else f": {actual} != {expected}"))
+
+
+# Commands covering the regex fast path and every case it hands over to shlex
+COMMANDS = [
+    "s3 ls",
+    "aws ec2 describe-instances --instance-ids i-1 i-2",
+    "  s3api list-objects-v2\t--bucket  b  ",
+    "",
+    "logs filter-log-events --filter-pattern 'ERROR timeout'",
+    'dynamodb get-item --key \'{"id": {"S": "a b"}}\'',
+    'ec2 describe-instances --filters "Name=tag:Name,Values=web server"',
+    "ec2 describe-tags --filters Name=key,Values='a'\"b\"",
+    "s3 ls s3://bucket/''",
+    "ec2 describe-tags --filters '' \"\" a''b \"it's\"",
+    'cloudwatch get-metric-data --queries "[{\\"Id\\": \\"m1\\"}]"',
+    "ssm get-parameter --name a\\ b",
+    "s3 ls # not a comment",
+    "iam list-users\n--max-items 5",
+    "sts get-caller-identity --query 'Account",
+    'sts get-caller-identity --query "Account',
+]
+
+
+def split_or_error(split, command):
+    """Split a command, or return the exception type if it is rejected."""
+    try:
+        return split(command)
+    except ValueError as e:
+        return type(e)
+
+
+def test_split_command():
+    """_split_command agrees with shlex.split, including on malformed input."""
+    print("\n✂️ Test: Command Splitting vs shlex.split")
+
+    for command in COMMANDS:
+        expected = split_or_error(shlex.split, command)
+        actual = split_or_error(_split_command, command)
+        check(actual == expected, repr(command) + ("" if actual == expected else f": {actual} != {expected}"))
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Parsers")
+    print("=" * 50)
+
+    test_parse_aws_config()
+    test_split_command()
+
+    print("\n🎉 Tests completed!" if not failures else f"\n❌ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Unit tests for the stdio AWS MCP server that need no AWS access."""
+
+import asyncio
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aws_mcp_server
+from aws_mcp_server import AWSMCPServer
+
+failures = 0
+
+
+def check(ok, label):
+    """Report one check, counting failures for the exit status."""
+    global failures
+    if not ok:
+        failures += 1
+    print(f"   {'✅' if ok else '❌'} {label}")
+
+
+def test_unreadable_config():
+    """An AWS config that exists but cannot be read yields no profiles."""
+    print("\n📋 Test: Unreadable AWS Config")
+
+    with tempfile.TemporaryDirectory() as home:
+        # A directory where the file should be passes the stat but fails the open,
+        # even when running as root
+        os.makedirs(os.path.join(home, ".aws", "config"))
+        with mock.patch.dict(os.environ, {"HOME": home, "XDG_CACHE_HOME": os.path.join(home, "cache")}):
+            server = AWSMCPServer()
+            try:
+                profiles = server.aws_profiles
+            except OSError as e:
+                check(False, f"Loading profiles raised {e!r}")
+                return
+    check(profiles == {}, f"No profiles loaded: {profiles}")
+
+
+class LongPrefixServer(AWSMCPServer):
+    """A server whose prefixes go beyond the service-and-verb shape of the defaults."""
+
+    def _get_read_only_prefixes(self):
+        return super()._get_read_only_prefixes() + [
+            "servicecatalog search-provisioned-products",
+            "ssm get-parameters --with-decryption",
+        ]
+
+
+def classification_cases(prefix):
+    """Commands around a prefix: matches, near misses and the write next to it."""
+    service = prefix.split()[0]
+    return [
+        prefix,
+        f"{prefix}-instances --filters Name=tag:env,Values=prod",
+        f"aws {prefix.upper()} --output json",
+        f"  aws   {prefix}x",
+        f"{prefix[:-1]}",
+        f"{prefix[:-1]}z --query 'Items[0]'",
+        f"{service} create-thing --name x",
+        f"{service}  {prefix[len(service):].strip()}",
+    ]
+
+
+def test_classification_matches_prefixes():
+    """Classifying the command head agrees with checking the whole command."""
+    print("\n🔍 Test: Classification Against Every Prefix")
+
+    for server in (AWSMCPServer(), LongPrefixServer()):
+        mismatches = [
+            command
+            for prefix in server.read_only_prefixes
+            for command in classification_cases(prefix)
+            if server._is_read_only_command(command)
+            != aws_mcp_server._classify.__wrapped__(command, server._ro_prefixes, server._read_verbs)
+        ]
+        check(not mismatches, f"{type(server).__name__}: {len(server.read_only_prefixes)} prefixes"
+              + (f", mismatches: {mismatches}" if mismatches else ""))
+
+
+async def run_batch(commands):
+    """Run the batch tool with command execution stubbed out; returns (text, commands run)."""
+    server = AWSMCPServer()
+    executed = []
+
+    async def fake_execute(command, profile=None, region=None):
+        executed.append(command)
+        return True, f"output of {command}\n"
+
+    server.execute_aws_command = fake_execute
+    result = await server._handle_read_batch({"commands": commands})
+    return result[0].text, executed
+
+
+def test_read_batch():
+    """The batch tool's size limit, write rejection and output headers."""
+    print("\n📦 Test: Read Command Batches")
+
+    at_limit = [{"command": "s3 ls"}] * aws_mcp_server.READ_BATCH_MAX
+    text, executed = asyncio.run(run_batch(at_limit))
+    check(len(executed) == aws_mcp_server.READ_BATCH_MAX, f"A batch of {len(at_limit)} runs")
+
+    text, executed = asyncio.run(run_batch(at_limit + [{"command": "s3 ls"}]))
+    check(not executed and text.startswith("Error:"), f"A batch of {len(at_limit) + 1} is rejected: {text}")
+
+    text, executed = asyncio.run(run_batch([{"command": "s3 ls"}, {"command": "s3 rb s3://bucket"}]))
+    check(not executed and "not a read-only operation" in text, "A batch with a write is rejected without running")
+
+    text, _ = asyncio.run(run_batch([
+        {"command": "aws s3 ls", "profile": "dev"},
+        {"command": "ec2 describe-vpcs", "region": "eu-west-1"},
+    ]))
+    expected = ("$ aws s3 ls --profile dev\noutput of aws s3 ls\n\n"
+                "$ aws ec2 describe-vpcs --region eu-west-1\noutput of ec2 describe-vpcs")
+    check(text == expected, "Headers show each command once, with its profile and region")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing AWS MCP Server Internals")
+    print("=" * 50)
+
+    test_unreadable_config()
+    test_classification_matches_prefixes()
+    test_read_batch()
+
+    print("\n🎉 Tests completed!" if not failures else f"\n❌ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)